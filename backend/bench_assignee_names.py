@@ -0,0 +1,103 @@
+import os
+import time
+import uuid
+import random
+import argparse
+import statistics
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+load_dotenv('.env')
+
+from server import ASSIGNEE_NAME_STAGES  # noqa: E402
+
+MONGO_URL = os.getenv('MONGO_URL')
+BENCH_DB_NAME = os.getenv('BENCH_DB_NAME', 'taskflow_bench')
+
+def seed(db, task_count, user_count):
+    users = [{'id': str(uuid.uuid4()), 'email': f'user{i}@bench.test', 'full_name': f'User {i}'} for i in range(user_count)]
+    db.users.insert_many(users)
+    db.users.create_index('id', unique=True)
+    names = {u['id']: u['full_name'] for u in users}
+
+    org_id = str(uuid.uuid4())
+    print(f"Seeding {task_count} tasks over {user_count} assignees...", end=" ", flush=True)
+    batch = []
+    for i in range(task_count):
+        assignee = random.choice(users)['id'] if random.random() < 0.9 else None
+        batch.append({
+            'id': str(uuid.uuid4()),
+            'org_id': org_id,
+            'title': f'Task {i}',
+            'assigned_to': assignee,
+            # Only read by the denormalized variant
+            'assigned_to_name_denormalized': names.get(assignee),
+            'status': 'pending',
+            'created_at': f'2026-01-01T00:00:{i:09d}'
+        })
+        if len(batch) == 10000:
+            db.tasks.insert_many(batch)
+            batch = []
+    if batch:
+        db.tasks.insert_many(batch)
+    db.tasks.create_index([('org_id', 1), ('created_at', 1), ('id', 1)])
+    print("done")
+    return org_id
+
+def read_with_in(db, org_id, page):
+    tasks = list(db.tasks.find({'org_id': org_id}, {'_id': 0, 'assigned_to_name_denormalized': 0})
+                 .sort([('created_at', 1), ('id', 1)]).limit(page))
+    ids = list({t['assigned_to'] for t in tasks if t.get('assigned_to')})
+    names = {u['id']: u['full_name'] for u in db.users.find({'id': {'$in': ids}}, {'_id': 0, 'id': 1, 'full_name': 1})}
+    for task in tasks:
+        task['assigned_to_name'] = names.get(task.get('assigned_to'))
+    return tasks
+
+def read_with_lookup(db, org_id, page):
+    return list(db.tasks.aggregate([
+        {'$match': {'org_id': org_id}},
+        {'$sort': {'created_at': 1, 'id': 1}},
+        {'$limit': page},
+        {'$project': {'_id': 0, 'assigned_to_name_denormalized': 0}},
+        *ASSIGNEE_NAME_STAGES
+    ]))
+
+def read_denormalized(db, org_id, page):
+    return list(db.tasks.find({'org_id': org_id}, {'_id': 0})
+                .sort([('created_at', 1), ('id', 1)]).limit(page))
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+def bench_assignee_names(task_count, user_count, page, runs):
+    client = MongoClient(MONGO_URL)
+    db = client[BENCH_DB_NAME]
+    org_id = seed(db, task_count, user_count)
+
+    print(f"Page size {page}, {runs} runs (median)")
+    print("-" * 50)
+    results = {
+        'find + $in (two queries)': timed(lambda: read_with_in(db, org_id, page), runs),
+        'aggregate + $lookup': timed(lambda: read_with_lookup(db, org_id, page), runs),
+        'denormalized name': timed(lambda: read_denormalized(db, org_id, page), runs),
+    }
+    for name, median in results.items():
+        print(f"{name:<28} {median:8.2f} ms")
+    print(f"Fastest: {min(results, key=results.get)}")
+
+    client.drop_database(BENCH_DB_NAME)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare ways of resolving assignee names on task reads.')
+    parser.add_argument('--tasks', type=int, default=100000, help='Tasks in the benchmark org')
+    parser.add_argument('--users', type=int, default=200, help='Distinct assignees')
+    parser.add_argument('--page', type=int, default=200, help='Tasks per read')
+    parser.add_argument('--runs', type=int, default=30, help='Timed runs per variant')
+    args = parser.parse_args()
+
+    bench_assignee_names(args.tasks, args.users, args.page, args.runs)
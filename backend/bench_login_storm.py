@@ -0,0 +1,77 @@
+import requests
+import uuid
+import time
+import threading
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+PASSWORD = "Password123!"
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def bench_login_storm(base_url, concurrency, duration):
+    api = f"{base_url}/api"
+    email = f"bench_{uuid.uuid4().hex[:8]}@example.com"
+
+    print(f"Target: {base_url}")
+    print(f"Login concurrency: {concurrency}, duration: {duration}s")
+    print("-" * 50)
+
+    resp = requests.post(f"{api}/auth/register", json={
+        "email": email,
+        "password": PASSWORD,
+        "full_name": "Benchmark User"
+    }, timeout=30)
+    resp.raise_for_status()
+    token = resp.json()['access_token']
+    headers = {'Authorization': f'Bearer {token}'}
+
+    stop = threading.Event()
+    login_ok = []
+    login_rejected = []
+    probe_latencies = []
+
+    def login_worker():
+        session = requests.Session()
+        while not stop.is_set():
+            r = session.post(f"{api}/auth/login", json={"email": email, "password": PASSWORD}, timeout=30)
+            if r.status_code == 200:
+                login_ok.append(1)
+            elif r.status_code == 503:
+                login_rejected.append(1)
+
+    def probe_worker():
+        # Unrelated, cheap endpoint: its latency shows how much the logins stall the loop
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.perf_counter()
+            session.get(f"{api}/auth/me", headers=headers, timeout=30)
+            probe_latencies.append(time.perf_counter() - started)
+            time.sleep(0.05)
+
+    with ThreadPoolExecutor(max_workers=concurrency + 1) as pool:
+        for _ in range(concurrency):
+            pool.submit(login_worker)
+        pool.submit(probe_worker)
+        time.sleep(duration)
+        stop.set()
+
+    print(f"Logins completed:   {len(login_ok)} ({len(login_ok) / duration:.1f}/s)")
+    print(f"Logins rejected:    {len(login_rejected)} (503 backpressure)")
+    print(f"/auth/me samples:   {len(probe_latencies)}")
+    print(f"/auth/me p50:       {percentile(probe_latencies, 50) * 1000:.1f} ms")
+    print(f"/auth/me p99:       {percentile(probe_latencies, 99) * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Benchmark login throughput and unrelated-endpoint latency under a login storm.')
+    parser.add_argument('url', nargs='?', default='http://localhost:8000', help='Base URL of the server')
+    parser.add_argument('--concurrency', type=int, default=32, help='Number of concurrent login clients')
+    parser.add_argument('--duration', type=int, default=20, help='Benchmark duration in seconds')
+    args = parser.parse_args()
+
+    bench_login_storm(args.url.rstrip('/'), args.concurrency, args.duration)
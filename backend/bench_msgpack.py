@@ -0,0 +1,40 @@
+import gzip
+import json
+import time
+import argparse
+import msgpack
+
+from bench_task_serialization import make_tasks
+
+def timed(fn, runs):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def bench_msgpack(counts, runs):
+    print(f"Runs: {runs} (best of)")
+    print("-" * 50)
+    for count in counts:
+        tasks = make_tasks(count)
+        json_body = json.dumps(tasks, separators=(',', ':')).encode('utf-8')
+        msgpack_body = msgpack.packb(tasks)
+        assert msgpack.unpackb(msgpack_body) == json.loads(json_body)
+
+        print(f"{count} tasks")
+        print(f"  size     json {len(json_body):>10} B   msgpack {len(msgpack_body):>10} B")
+        print(f"  gzipped  json {len(gzip.compress(json_body)):>10} B   msgpack {len(gzip.compress(msgpack_body)):>10} B")
+        print(f"  encode   json {timed(lambda: json.dumps(tasks, separators=(',', ':')).encode('utf-8'), runs):>10.2f} ms"
+              f"  msgpack {timed(lambda: msgpack.packb(tasks), runs):>10.2f} ms")
+        print(f"  decode   json {timed(lambda: json.loads(json_body), runs):>10.2f} ms"
+              f"  msgpack {timed(lambda: msgpack.unpackb(msgpack_body), runs):>10.2f} ms")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare JSON and MessagePack for task list payloads.')
+    parser.add_argument('--counts', type=int, nargs='+', default=[100, 1000, 10000], help='Tasks per payload')
+    parser.add_argument('--runs', type=int, default=20, help='Timed runs per measurement')
+    args = parser.parse_args()
+
+    bench_msgpack(args.counts, args.runs)
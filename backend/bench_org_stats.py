@@ -0,0 +1,97 @@
+import os
+import time
+import uuid
+import random
+import argparse
+import statistics
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+load_dotenv('.env')
+
+from server import org_stats_pipeline  # noqa: E402
+
+MONGO_URL = os.getenv('MONGO_URL')
+BENCH_DB_NAME = os.getenv('BENCH_DB_NAME', 'taskflow_bench')
+STATUSES = ['pending', 'about_to_do', 'completed']
+
+def seed_org(db, task_count, user_ids):
+    org_id = str(uuid.uuid4())
+    print(f"Seeding {task_count} tasks for org {org_id}...", end=" ", flush=True)
+    batch = []
+    for i in range(task_count):
+        batch.append({
+            'id': str(uuid.uuid4()),
+            'org_id': org_id,
+            'title': f'Task {i}',
+            'assigned_to': random.choice(user_ids),
+            'status': random.choice(STATUSES),
+            'is_daily': False,
+            'created_by': user_ids[0],
+            'created_at': '2026-01-01T00:00:00+00:00'
+        })
+        if len(batch) == 10000:
+            db.tasks.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        db.tasks.insert_many(batch, ordered=False)
+    db.organization_members.insert_many([
+        {'id': str(uuid.uuid4()), 'user_id': user_id, 'org_id': org_id, 'role': 'employee'}
+        for user_id in user_ids
+    ])
+    print("done")
+    return org_id
+
+def old_stats(db, org_id, user_id):
+    return {
+        'total_tasks': db.tasks.count_documents({'org_id': org_id}),
+        'pending_tasks': db.tasks.count_documents({'org_id': org_id, 'status': 'pending'}),
+        'in_progress_tasks': db.tasks.count_documents({'org_id': org_id, 'status': 'about_to_do'}),
+        'completed_tasks': db.tasks.count_documents({'org_id': org_id, 'status': 'completed'}),
+        'my_tasks': db.tasks.count_documents({'org_id': org_id, 'assigned_to': user_id}),
+        'members_count': db.organization_members.count_documents({'org_id': org_id})
+    }
+
+def new_stats(db, org_id, user_id, pool):
+    members = pool.submit(db.organization_members.count_documents, {'org_id': org_id})
+    facet = list(db.tasks.aggregate(org_stats_pipeline(org_id)))[0]
+    return facet, members.result()
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), max(samples)
+
+def bench_org_stats(sizes, runs):
+    client = MongoClient(MONGO_URL)
+    db = client[BENCH_DB_NAME]
+    db.tasks.create_index([('org_id', 1), ('status', 1)])
+    db.tasks.create_index([('org_id', 1), ('assigned_to', 1)])
+    db.organization_members.create_index([('org_id', 1)])
+    user_ids = [str(uuid.uuid4()) for _ in range(50)]
+
+    print(f"Database: {BENCH_DB_NAME}")
+    print("-" * 50)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for size in sizes:
+            org_id = seed_org(db, size, user_ids)
+            old_median, old_max = timed(lambda: old_stats(db, org_id, user_ids[0]), runs)
+            new_median, new_max = timed(lambda: new_stats(db, org_id, user_ids[0], pool), runs)
+            print(f"{size:>9} tasks  old: median {old_median:8.1f} ms, max {old_max:8.1f} ms")
+            print(f"{size:>9} tasks  new: median {new_median:8.1f} ms, max {new_max:8.1f} ms")
+
+    client.drop_database(BENCH_DB_NAME)
+    print("-" * 50)
+    print("Benchmark database dropped.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Compare old and new get_org_stats query cost.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000], help='Tasks per org to benchmark')
+    parser.add_argument('--runs', type=int, default=20, help='Timed runs per size')
+    args = parser.parse_args()
+
+    bench_org_stats(args.sizes, args.runs)
@@ -0,0 +1,71 @@
+import json
+import time
+import uuid
+import argparse
+from typing import List
+from pydantic import TypeAdapter
+from fastapi.encoders import jsonable_encoder
+
+from server import TaskResponse, TaskListAdapter
+
+def make_tasks(count):
+    user_id = str(uuid.uuid4())
+    org_id = str(uuid.uuid4())
+    return [{
+        'id': str(uuid.uuid4()),
+        'org_id': org_id,
+        'title': f'Task {i}',
+        'description': 'Follow up with the customer and update the ticket. ' * 3,
+        'assigned_to': user_id,
+        'assigned_to_name': 'Benchmark User',
+        'status': ['pending', 'about_to_do', 'completed'][i % 3],
+        'duration_minutes': 30,
+        'is_daily': i % 5 == 0,
+        'due_date': '2026-12-01',
+        'created_at': '2026-01-01T00:00:00+00:00',
+        'created_by': user_id,
+        'updated_at': '2026-01-01T00:00:00+00:00',
+        'version': i
+    } for i in range(count)]
+
+# What FastAPI does for a response_model=List[TaskResponse] route returning models
+response_field = TypeAdapter(List[TaskResponse])
+
+def old_path(tasks):
+    models = [TaskResponse(**task) for task in tasks]
+    validated = response_field.validate_python([m.model_dump() for m in models])
+    content = jsonable_encoder(response_field.dump_python(validated, mode='json'))
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(',', ':')).encode('utf-8')
+
+def new_path(tasks):
+    return TaskListAdapter.dump_json(TaskListAdapter.validate_python(tasks))
+
+def timed(fn, tasks, runs):
+    best = float('inf')
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn(tasks)
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+def bench_task_serialization(count, runs):
+    tasks = make_tasks(count)
+    assert json.loads(old_path(tasks)) == json.loads(new_path(tasks))
+
+    old_ms = timed(old_path, tasks, runs)
+    new_ms = timed(new_path, tasks, runs)
+    per_1k = 1000 / count
+
+    print(f"Tasks: {count}, runs: {runs} (best of)")
+    print("-" * 50)
+    print(f"response_model + stdlib json: {old_ms:8.2f} ms ({old_ms * per_1k:.2f} ms per 1k tasks)")
+    print(f"TypeAdapter + dump_json:      {new_ms:8.2f} ms ({new_ms * per_1k:.2f} ms per 1k tasks)")
+    print(f"Speedup: {old_ms / new_ms:.1f}x")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Microbenchmark get_tasks serialization cost.')
+    parser.add_argument('--count', type=int, default=1000, help='Tasks per response')
+    parser.add_argument('--runs', type=int, default=50, help='Timed runs')
+    args = parser.parse_args()
+
+    bench_task_serialization(args.count, args.runs)
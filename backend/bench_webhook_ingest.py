@@ -0,0 +1,87 @@
+import os
+import hmac
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def make_event(org_ids, created):
+    return {
+        'id': f'evt_bench_{uuid.uuid4().hex}',
+        'object': 'event',
+        'type': 'checkout.session.completed',
+        'created': created,
+        'data': {'object': {
+            # No matching transaction, so applying these changes nothing
+            'id': f'cs_bench_{uuid.uuid4().hex}',
+            'object': 'checkout.session',
+            'payment_status': random.choice(['paid', 'unpaid']),
+            'metadata': {'org_id': random.choice(org_ids)}
+        }}
+    }
+
+def sign(payload, secret):
+    timestamp = int(time.time())
+    digest = hmac.new(secret.encode('utf-8'), f'{timestamp}.{payload}'.encode('utf-8'), hashlib.sha256).hexdigest()
+    return f't={timestamp},v1={digest}'
+
+def bench_webhook_ingest(base_url, count, concurrency, orgs, duplicate_rate, secret):
+    url = f"{base_url}/api/payments/webhook"
+    org_ids = [str(uuid.uuid4()) for _ in range(orgs)]
+    started_at = int(time.time())
+    events = [make_event(org_ids, started_at + i) for i in range(count)]
+    # Stripe redelivers; resend a share of events to exercise deduplication
+    events += random.sample(events, int(count * duplicate_rate))
+    random.shuffle(events)
+
+    print(f"Target: {url}")
+    print(f"Events: {len(events)} ({len(events) - count} redeliveries) over {orgs} orgs, concurrency {concurrency}")
+    print(f"Signed: {'yes' if secret else 'no'}")
+    print("-" * 50)
+
+    latencies = []
+    statuses = {}
+
+    def send(event):
+        payload = json.dumps(event)
+        headers = {'Content-Type': 'application/json'}
+        if secret:
+            headers['Stripe-Signature'] = sign(payload, secret)
+        started = time.perf_counter()
+        r = requests.post(url, data=payload, headers=headers, timeout=30)
+        latencies.append(time.perf_counter() - started)
+        statuses[r.status_code] = statuses.get(r.status_code, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(send, events))
+    elapsed = time.perf_counter() - started
+
+    print(f"Acked in:      {elapsed:.1f}s ({len(events) / elapsed:.0f} events/s)")
+    print(f"Status codes:  {statuses}")
+    print(f"Ack p50:       {percentile(latencies, 50) * 1000:.1f} ms")
+    print(f"Ack p99:       {percentile(latencies, 99) * 1000:.1f} ms")
+    print("Processing continues in the background; watch /api/admin/webhook-stats until 'queued' drains.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fire synthetic Stripe webhook events at the server.')
+    parser.add_argument('url', nargs='?', default='http://localhost:8000', help='Base URL of the server')
+    parser.add_argument('--events', type=int, default=5000, help='Distinct events to send')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent senders')
+    parser.add_argument('--orgs', type=int, default=50, help='Orgs the events are spread over')
+    parser.add_argument('--duplicates', type=float, default=0.1, help='Fraction of events delivered twice')
+    parser.add_argument('--secret', default=os.getenv('STRIPE_WEBHOOK_SECRET'), help='Webhook signing secret, if the server enforces one')
+    args = parser.parse_args()
+
+    bench_webhook_ingest(args.url.rstrip('/'), args.events, args.concurrency, args.orgs, args.duplicates, args.secret)
@@ -0,0 +1,108 @@
+import json
+import time
+import uuid
+import random
+import argparse
+import threading
+from urllib.parse import parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Minimal stand-in for the Checkout Session endpoints the backend uses.
+# Run it and start the backend with STRIPE_API_BASE=http://127.0.0.1:<port>
+
+sessions = {}
+lock = threading.Lock()
+
+def session_object(session_id, params):
+    amount = int(params.get('line_items[0][price_data][unit_amount]', ['0'])[0])
+    return {
+        'id': session_id,
+        'object': 'checkout.session',
+        'url': f'https://checkout.fake.test/pay/{session_id}',
+        'status': 'open',
+        'payment_status': 'unpaid',
+        'amount_total': amount,
+        'currency': params.get('line_items[0][price_data][currency]', ['usd'])[0],
+        'metadata': {
+            key[len('metadata['):-1]: values[0]
+            for key, values in params.items() if key.startswith('metadata[')
+        }
+    }
+
+class FakeStripeHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_rate = 0.0
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Request-Id', f'req_{uuid.uuid4().hex[:14]}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_json(self, status, error_type, message):
+        self.send_json(status, {'error': {'type': error_type, 'message': message}})
+
+    def simulate_conditions(self):
+        if self.delay:
+            time.sleep(self.delay)
+        if random.random() < self.fail_rate:
+            self.send_error_json(500, 'api_error', 'Injected failure')
+            return False
+        return True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        params = parse_qs(self.rfile.read(length).decode('utf-8'))
+
+        # Test hook: mark a session as paid, as if the customer completed checkout
+        if self.path.startswith('/fake/sessions/') and self.path.endswith('/pay'):
+            session_id = self.path.split('/')[3]
+            with lock:
+                session = sessions.get(session_id)
+                if session:
+                    session.update(status='complete', payment_status='paid')
+            if not session:
+                return self.send_error_json(404, 'invalid_request_error', f'No such checkout.session: {session_id}')
+            return self.send_json(200, session)
+
+        if self.path != '/v1/checkout/sessions':
+            return self.send_error_json(404, 'invalid_request_error', f'Unrecognized request URL (POST: {self.path})')
+        if not self.simulate_conditions():
+            return
+        session_id = f'cs_test_{uuid.uuid4().hex}'
+        with lock:
+            sessions[session_id] = session_object(session_id, params)
+            session = dict(sessions[session_id])
+        self.send_json(200, session)
+
+    def do_GET(self):
+        prefix = '/v1/checkout/sessions/'
+        if not self.path.startswith(prefix):
+            return self.send_error_json(404, 'invalid_request_error', f'Unrecognized request URL (GET: {self.path})')
+        if not self.simulate_conditions():
+            return
+        session_id = self.path[len(prefix):].split('?')[0]
+        with lock:
+            session = dict(sessions[session_id]) if session_id in sessions else None
+        if not session:
+            return self.send_error_json(404, 'invalid_request_error', f'No such checkout.session: {session_id}')
+        self.send_json(200, session)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run a local fake Stripe API for payment testing.')
+    parser.add_argument('--port', type=int, default=12111, help='Port to listen on')
+    parser.add_argument('--delay', type=float, default=0.0, help='Seconds to stall every API call')
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='Fraction of API calls answered with a 500')
+    args = parser.parse_args()
+
+    FakeStripeHandler.delay = args.delay
+    FakeStripeHandler.fail_rate = args.fail_rate
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), FakeStripeHandler)
+    print(f"Fake Stripe listening on http://127.0.0.1:{args.port} (delay {args.delay}s, fail rate {args.fail_rate})")
+    server.serve_forever()
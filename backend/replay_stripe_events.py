@@ -0,0 +1,63 @@
+import os
+import argparse
+from datetime import datetime, timezone
+from pymongo import MongoClient
+from dotenv import load_dotenv
+
+load_dotenv('.env')
+
+MONGO_URL = os.getenv('MONGO_URL')
+DB_NAME = os.getenv('DB_NAME')
+
+def build_filter(args):
+    query = {}
+    if args.event_id:
+        query['event_id'] = {'$in': args.event_id}
+    else:
+        query['status'] = {'$in': args.status}
+    if args.type:
+        query['type'] = args.type
+    if args.org:
+        query['partition'] = args.org
+    if args.since:
+        query['received_at'] = {'$gte': datetime.fromisoformat(args.since).replace(tzinfo=timezone.utc)}
+    return query
+
+def replay_stripe_events(args):
+    client = MongoClient(MONGO_URL)
+    db = client[DB_NAME]
+    query = build_filter(args)
+
+    print(f"Database: {DB_NAME}")
+    print(f"Filter: {query}")
+    print("-" * 50)
+
+    matched = db.stripe_events.count_documents(query)
+    for event in db.stripe_events.find(query, {'_id': 0, 'event_id': 1, 'type': 1, 'status': 1, 'attempts': 1, 'error': 1}).limit(20):
+        error = f" ({event['error']})" if event.get('error') else ''
+        print(f"  {event['event_id']}  {event['type']}  {event['status']}  attempts={event.get('attempts', 0)}{error}")
+    if matched > 20:
+        print(f"  ... and {matched - 20} more")
+
+    if args.dry_run or not matched:
+        print(f"{matched} event(s) matched, nothing changed.")
+        return
+
+    # Handlers are idempotent and ordered by event time, so applied events replay safely
+    result = db.stripe_events.update_many(query, {
+        '$set': {'status': 'pending', 'attempts': 0, 'next_attempt_at': datetime.now(timezone.utc)},
+        '$unset': {'error': '', 'lease_until': '', 'applied_at': ''}
+    })
+    print(f"{result.modified_count} event(s) queued for replay; running servers pick them up on their next sweep.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Requeue stored Stripe webhook events for the background processor.')
+    parser.add_argument('--status', nargs='+', default=['failed'], help='Statuses to replay (default: failed)')
+    parser.add_argument('--event-id', nargs='+', help='Replay these event ids regardless of status')
+    parser.add_argument('--type', help='Only events of this type, e.g. checkout.session.completed')
+    parser.add_argument('--org', help='Only events for this org id')
+    parser.add_argument('--since', help='Only events received at or after this UTC time (ISO 8601)')
+    parser.add_argument('--dry-run', action='store_true', help='List matching events without changing them')
+    args = parser.parse_args()
+
+    replay_stripe_events(args)
@@ -1,13 +1,16 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, status
+from fastapi import FastAPI, APIRouter, HTTPException, Depends, Request, Response, Query, Header, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from dotenv import load_dotenv
+from fastapi.responses import StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
 import logging
 from pathlib import Path
-from pydantic import BaseModel, Field, ConfigDict, EmailStr
-from typing import List, Optional, Dict
+from pydantic import BaseModel, Field, ConfigDict, EmailStr, ValidationError, TypeAdapter, create_model
+from typing import Any, List, Optional, Dict, Tuple
 import uuid
 from datetime import datetime, timezone, timedelta
 import bcrypt
@@ -15,6 +18,31 @@ import jwt
 import stripe
 import asyncio
 import certifi
+import base64
+import functools
+import csv
+import io
+import hashlib
+import json
+import random
+import time
+from collections import OrderedDict, deque
+import gzip
+import zlib
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from starlette.datastructures import Headers, MutableHeaders
+
+from fastapi.routing import APIRoute
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # without msgpack every response stays JSON
+    msgpack = None
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -33,11 +61,178 @@ JWT_EXPIRATION_HOURS = 24
 STRIPE_API_KEY = os.environ.get('STRIPE_API_KEY', 'sk_test_emergent')
 stripe.api_key = STRIPE_API_KEY
 
+# Point the SDK at a local fake Stripe server for testing
+STRIPE_API_BASE = os.environ.get('STRIPE_API_BASE')
+if STRIPE_API_BASE:
+    stripe.api_base = STRIPE_API_BASE
+
+# Payment status polling
+PAYMENT_STATUS_CACHE_SIZE = int(os.environ.get('PAYMENT_STATUS_CACHE_SIZE', 10000))
+PAYMENT_STATUS_CACHE_TTL_SECONDS = float(os.environ.get('PAYMENT_STATUS_CACHE_TTL_SECONDS', 3))
+PAYMENT_STATUS_PAID_TTL_SECONDS = float(os.environ.get('PAYMENT_STATUS_PAID_TTL_SECONDS', 300))
+PAYMENT_LONG_POLL_MAX_SECONDS = float(os.environ.get('PAYMENT_LONG_POLL_MAX_SECONDS', 25))
+PAYMENT_LONG_POLL_RECHECK_SECONDS = float(os.environ.get('PAYMENT_LONG_POLL_RECHECK_SECONDS', 5))
+
+# Stripe webhook ingestion
+WEBHOOK_WORKERS = int(os.environ.get('WEBHOOK_WORKERS', 4))
+WEBHOOK_QUEUE_SIZE = int(os.environ.get('WEBHOOK_QUEUE_SIZE', 10000))
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get('WEBHOOK_MAX_ATTEMPTS', 8))
+WEBHOOK_LEASE_SECONDS = float(os.environ.get('WEBHOOK_LEASE_SECONDS', 60))
+WEBHOOK_SWEEP_SECONDS = float(os.environ.get('WEBHOOK_SWEEP_SECONDS', 15))
+WEBHOOK_EVENT_RETENTION_DAYS = int(os.environ.get('WEBHOOK_EVENT_RETENTION_DAYS', 30))
+
+# Admin config store
+CONFIG_POLL_SECONDS = float(os.environ.get('CONFIG_POLL_SECONDS', 5))
+
+# Stripe call executor
+STRIPE_WORKERS = int(os.environ.get('STRIPE_WORKERS', 8))
+STRIPE_QUEUE_SIZE = int(os.environ.get('STRIPE_QUEUE_SIZE', STRIPE_WORKERS * 4))
+STRIPE_TIMEOUT_SECONDS = float(os.environ.get('STRIPE_TIMEOUT_SECONDS', 10))
+STRIPE_RETRIES = int(os.environ.get('STRIPE_RETRIES', 2))
+STRIPE_RETRY_BASE_SECONDS = float(os.environ.get('STRIPE_RETRY_BASE_SECONDS', 0.25))
+STRIPE_BREAKER_THRESHOLD = int(os.environ.get('STRIPE_BREAKER_THRESHOLD', 5))
+STRIPE_BREAKER_RESET_SECONDS = float(os.environ.get('STRIPE_BREAKER_RESET_SECONDS', 30))
+
+# Retries happen in StripeGateway; the SDK's own HTTP timeout frees a worker
+# thread shortly after we stop waiting for it
+stripe.max_network_retries = 0
+stripe.default_http_client = stripe.new_default_http_client(timeout=STRIPE_TIMEOUT_SECONDS)
+
+# Password hashing pool
+PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE', PASSWORD_HASH_WORKERS * 8))
+
+# Authenticated principal cache
+PRINCIPAL_CACHE_SIZE = int(os.environ.get('PRINCIPAL_CACHE_SIZE', 10000))
+PRINCIPAL_CACHE_TTL_SECONDS = float(os.environ.get('PRINCIPAL_CACHE_TTL_SECONDS', 60))
+
+# User display-name cache
+NAME_CACHE_SIZE = int(os.environ.get('NAME_CACHE_SIZE', 50000))
+NAME_CACHE_TTL_SECONDS = float(os.environ.get('NAME_CACHE_TTL_SECONDS', 300))
+
+# Organization role cache
+ROLE_CACHE_SIZE = int(os.environ.get('ROLE_CACHE_SIZE', 50000))
+ROLE_CACHE_TTL_SECONDS = float(os.environ.get('ROLE_CACHE_TTL_SECONDS', 30))
+ROLE_CACHE_NEGATIVE_TTL_SECONDS = float(os.environ.get('ROLE_CACHE_NEGATIVE_TTL_SECONDS', 5))
+
+# Task list pagination
+TASK_PAGE_SIZE = int(os.environ.get('TASK_PAGE_SIZE', 200))
+TASK_PAGE_SIZE_MAX = int(os.environ.get('TASK_PAGE_SIZE_MAX', 1000))
+
+# Task export streaming
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', 1000))
+
+# Bulk task endpoints
+BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 1000))
+
+# Task delta sync
+TASK_DELTA_MAX = int(os.environ.get('TASK_DELTA_MAX', 5000))
+TASK_DELTA_OVERLAP_SECONDS = float(os.environ.get('TASK_DELTA_OVERLAP_SECONDS', 10))
+TOMBSTONE_TTL_DAYS = int(os.environ.get('TOMBSTONE_TTL_DAYS', 30))
+
+# Live task feed
+TASK_STREAM_QUEUE_SIZE = int(os.environ.get('TASK_STREAM_QUEUE_SIZE', 1000))
+TASK_STREAM_REPLAY_SIZE = int(os.environ.get('TASK_STREAM_REPLAY_SIZE', 5000))
+TASK_STREAM_KEEPALIVE_SECONDS = float(os.environ.get('TASK_STREAM_KEEPALIVE_SECONDS', 15))
+TASK_STREAM_IDLE_GRACE_SECONDS = float(os.environ.get('TASK_STREAM_IDLE_GRACE_SECONDS', 60))
+
+# Response compression
+COMPRESSION_MIN_BYTES = int(os.environ.get('COMPRESSION_MIN_BYTES', 1024))
+COMPRESSION_OFFLOAD_BYTES = int(os.environ.get('COMPRESSION_OFFLOAD_BYTES', 256 * 1024))
+COMPRESSION_WORKERS = int(os.environ.get('COMPRESSION_WORKERS', 2))
+GZIP_LEVEL = int(os.environ.get('GZIP_LEVEL', 6))
+BROTLI_QUALITY = int(os.environ.get('BROTLI_QUALITY', 5))
+
+# Index bootstrap: 'warn' logs problems, 'strict' aborts startup, 'off' skips the checks
+INDEX_CHECK_MODE = os.environ.get('INDEX_CHECK_MODE', 'warn')
+
+# Org version cache behind conditional GETs
+ORG_VERSION_CACHE_SIZE = int(os.environ.get('ORG_VERSION_CACHE_SIZE', 10000))
+ORG_VERSION_CACHE_TTL_SECONDS = float(os.environ.get('ORG_VERSION_CACHE_TTL_SECONDS', 2))
+
 # Security
 security = HTTPBearer()
 
+# Content negotiation: JSON by default, MessagePack on request
+MSGPACK_TYPES = ('application/msgpack', 'application/x-msgpack')
+
+def accept_weights(accept: str) -> Dict[str, float]:
+    """Media type -> q-value from an Accept header; the highest wins for repeats."""
+    weights: Dict[str, float] = {}
+    for part in accept.split(','):
+        media_type, *params = [p.strip() for p in part.split(';')]
+        if not media_type:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        media_type = media_type.lower()
+        weights[media_type] = max(q, weights.get(media_type, 0.0))
+    return weights
+
+def wants_msgpack(request: Request) -> bool:
+    """MessagePack only when the client weights it strictly above JSON."""
+    if msgpack is None:
+        return False
+    weights = accept_weights(request.headers.get('accept', ''))
+    msgpack_q = max((weights.get(t, 0.0) for t in MSGPACK_TYPES), default=0.0)
+    if msgpack_q <= 0:
+        return False
+    # The most specific range that covers JSON decides its weight
+    json_q = next((weights[t] for t in ('application/json', 'application/*', '*/*') if t in weights), 0.0)
+    return msgpack_q > json_q
+
+class MessagePackRequest(Request):
+    """Request whose msgpack body is handed to FastAPI through ``json()``."""
+
+    async def json(self):
+        if not hasattr(self, '_json'):
+            self._json = msgpack.unpackb(await self.body())
+        return self._json
+
+class NegotiatedRoute(APIRoute):
+    """Accepts msgpack request bodies and re-encodes JSON responses as msgpack."""
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        
+        async def negotiated_handler(request: Request) -> Response:
+            content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+            if msgpack is not None and content_type in MSGPACK_TYPES:
+                # FastAPI only parses JSON bodies, so present this one as JSON
+                scope = dict(request.scope)
+                scope['headers'] = [
+                    (k, b'application/json' if k == b'content-type' else v)
+                    for k, v in request.scope['headers']
+                ]
+                request = MessagePackRequest(scope, request.receive)
+            
+            response = await handler(request)
+            if (
+                wants_msgpack(request)
+                and response.media_type == 'application/json'
+                and not isinstance(response, StreamingResponse)
+            ):
+                headers = {k: v for k, v in response.headers.items() if k not in ('content-length', 'content-type')}
+                response = Response(
+                    content=msgpack.packb(json.loads(response.body)),
+                    status_code=response.status_code,
+                    media_type='application/msgpack',
+                    headers=headers
+                )
+            if msgpack is not None:
+                response.headers.append('Vary', 'Accept')
+            return response
+        
+        return negotiated_handler
+
 app = FastAPI()
-api_router = APIRouter(prefix="/api")
+api_router = APIRouter(prefix="/api", route_class=NegotiatedRoute)
 
 @app.get("/")
 async def health_check():
@@ -122,6 +317,23 @@ class TaskResponse(BaseModel):
     due_date: Optional[str] = None
     created_at: str
     created_by: str
+    updated_at: Optional[str] = None
+    version: int = 0
+
+class TaskChangesResponse(BaseModel):
+    version: int
+    reset: bool
+    tasks: List[TaskResponse]
+    deleted: List[str]
+
+class TaskBulkSelector(BaseModel):
+    ids: Optional[List[str]] = None
+    status: Optional[str] = None
+    assigned_to: Optional[str] = None
+    is_daily: Optional[bool] = None
+
+class TaskBulkUpdate(TaskBulkSelector):
+    update: TaskUpdate
 
 class AdminConfigUpdate(BaseModel):
     key_name: str
@@ -132,6 +344,421 @@ class CheckoutRequest(BaseModel):
     package_id: str
     org_id: str
 
+# ==================== FAST RESPONSES ====================
+
+# Hot list endpoints validate once through these adapters and serialize with
+# pydantic's Rust encoder, skipping FastAPI's second response_model pass.
+TaskListAdapter = TypeAdapter(List[TaskResponse])
+OrganizationListAdapter = TypeAdapter(List[OrganizationResponse])
+
+TaskChangesAdapter = TypeAdapter(TaskChangesResponse)
+
+# Sparse fieldsets: ?fields=a,b,c selects from these, in this order
+TASK_FIELDS = tuple(TaskResponse.model_fields)
+MEMBER_FIELDS = ('id', 'user_id', 'email', 'full_name', 'role', 'created_at')
+
+def parse_fields(fields: Optional[str], allowed: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """Validate a ``fields=`` parameter and normalize it to ``allowed`` order."""
+    if not fields:
+        return None
+    selected = {f.strip() for f in fields.split(',') if f.strip()}
+    unknown = selected - set(allowed)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+    return tuple(f for f in allowed if f in selected)
+
+@functools.lru_cache(maxsize=128)
+def task_fields_adapter(fields: Tuple[str, ...]) -> TypeAdapter:
+    model = create_model(
+        'TaskFieldsResponse',
+        **{name: (TaskResponse.model_fields[name].annotation, TaskResponse.model_fields[name]) for name in fields}
+    )
+    return TypeAdapter(List[model])
+
+def task_projection(fields: Optional[Tuple[str, ...]], required: Tuple[str, ...] = ()) -> dict:
+    """Mongo projection for the selected task fields plus any the handler needs."""
+    if fields is None:
+        return {'_id': 0}
+    projection = {'_id': 0}
+    for name in fields + required:
+        projection['assigned_to' if name == 'assigned_to_name' else name] = 1
+    return projection
+
+def typed_body(request: Request, adapter: TypeAdapter, value) -> Tuple[bytes, str]:
+    """Serialize an already-validated value straight to JSON or msgpack bytes."""
+    if wants_msgpack(request):
+        return msgpack.packb(adapter.dump_python(value, mode='json')), 'application/msgpack'
+    return adapter.dump_json(value), 'application/json'
+
+def body_response(response: Response, content: bytes, media_type: str) -> Response:
+    """Wrap serialized bytes, keeping headers already set on ``response``."""
+    headers = {k: v for k, v in response.headers.items() if k != 'content-length'}
+    return Response(content=content, media_type=media_type, headers=headers)
+
+def typed_response(request: Request, response: Response, adapter: TypeAdapter, value) -> Response:
+    return body_response(response, *typed_body(request, adapter, value))
+
+# ==================== COMPRESSION ====================
+
+COMPRESSIBLE_TYPES = {'application/json', 'application/msgpack', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html'}
+
+# zlib and brotli release the GIL, so large bodies compress on these threads
+compression_executor = ThreadPoolExecutor(max_workers=COMPRESSION_WORKERS, thread_name_prefix='compress')
+compression_stats = {'responses': 0, 'bytes_in': 0, 'bytes_out': 0}
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = {}
+    for part in accept_encoding.split(','):
+        name, _, params = part.strip().partition(';')
+        quality = 1.0
+        if params.strip().startswith('q='):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    if brotli is not None and accepted.get('br', 0) > 0:
+        return 'br'
+    if accepted.get('gzip', 0) > 0:
+        return 'gzip'
+    return None
+
+def compress_body(encoding: str, body: bytes) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class StreamCompressor:
+    """Incremental compressor that flushes each chunk so streams stay live."""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.finish() if self.encoding == 'br' else self._compressor.flush()
+
+async def run_compression(fn, data: bytes) -> bytes:
+    if len(data) >= COMPRESSION_OFFLOAD_BYTES:
+        return await asyncio.get_running_loop().run_in_executor(compression_executor, fn, data)
+    return fn(data)
+
+def record_compression(bytes_in: int, bytes_out: int, responses: int = 0):
+    compression_stats['responses'] += responses
+    compression_stats['bytes_in'] += bytes_in
+    compression_stats['bytes_out'] += bytes_out
+
+async def compress_stream(chunks, encoding: str):
+    """Compress a streaming body at the source, one flushed block per chunk."""
+    compressor = StreamCompressor(encoding)
+    record_compression(0, 0, responses=1)
+    async for chunk in chunks:
+        data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+        out = await run_compression(compressor.compress, data)
+        record_compression(len(data), len(out))
+        yield out
+    tail = compressor.finish()
+    record_compression(0, len(tail))
+    yield tail
+
+class CompressionMiddleware:
+    """gzip/brotli for allowlisted content types above a minimum size.
+
+    Responses that already carry a Content-Encoding (precompressed streams)
+    pass through untouched, as do event streams, which must not be buffered.
+    """
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_BYTES):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = choose_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        
+        start_message = None
+        compressor = None
+        passthrough = False
+        
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            
+            if message['type'] == 'http.response.start':
+                headers = Headers(raw=message['headers'])
+                content_type = headers.get('content-type', '').split(';')[0].strip()
+                if (
+                    message['status'] in (204, 304)
+                    or 'content-encoding' in headers
+                    or content_type not in COMPRESSIBLE_TYPES
+                ):
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+            
+            if message['type'] != 'http.response.body':
+                await send(message)
+                return
+            
+            body = message.get('body', b'')
+            more_body = message.get('more_body', False)
+            headers = MutableHeaders(raw=start_message['headers'])
+            
+            if compressor is None and not more_body:
+                # Whole body in one message: compress it in one go if it is worth it
+                headers.add_vary_header('Accept-Encoding')
+                if len(body) >= self.minimum_size:
+                    compressed = await run_compression(lambda data: compress_body(encoding, data), body)
+                    record_compression(len(body), len(compressed), responses=1)
+                    body = compressed
+                    headers['Content-Encoding'] = encoding
+                    headers['Content-Length'] = str(len(body))
+                passthrough = True
+                await send(start_message)
+                await send({'type': 'http.response.body', 'body': body})
+                return
+            
+            if compressor is None:
+                compressor = StreamCompressor(encoding)
+                headers.add_vary_header('Accept-Encoding')
+                headers['Content-Encoding'] = encoding
+                if 'content-length' in headers:
+                    del headers['content-length']
+                record_compression(0, 0, responses=1)
+                await send(start_message)
+            
+            out = await run_compression(compressor.compress, body) if body else b''
+            if not more_body:
+                out += compressor.finish()
+            record_compression(len(body), len(out))
+            await send({'type': 'http.response.body', 'body': out, 'more_body': more_body})
+        
+        await self.app(scope, receive, send_compressed)
+
+# ==================== CACHING ====================
+
+class TTLCache:
+    """Bounded in-process LRU cache whose entries expire after ``ttl`` seconds.
+
+    Caches are per worker process; the TTL bounds how stale another worker's
+    copy can be after an explicit invalidation here.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key):
+        entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses
+        }
+
+class PrincipalCache:
+    """Caches verified tokens, the user documents they resolve to and sys-admin status."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.tokens = TTLCache(maxsize, ttl)      # sha256(token) -> (user_id, exp)
+        self.users = TTLCache(maxsize, ttl)       # user_id -> user document
+        self.sys_admins = TTLCache(maxsize, ttl)  # user_id -> is sys admin
+
+    @staticmethod
+    def token_key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def invalidate_user(self, user_id: str):
+        """Call whenever a user document changes."""
+        self.users.pop(user_id)
+
+    def invalidate_sys_admin(self, user_id: str):
+        """Call whenever a user gains or loses sys-admin status."""
+        self.sys_admins.pop(user_id)
+
+    def clear(self):
+        self.tokens.clear()
+        self.users.clear()
+        self.sys_admins.clear()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {'tokens': self.tokens.stats(), 'users': self.users.stats(), 'sys_admins': self.sys_admins.stats()}
+
+principal_cache = PrincipalCache(PRINCIPAL_CACHE_SIZE, PRINCIPAL_CACHE_TTL_SECONDS)
+
+class NameBatch:
+    """Collects user ids during a request so they resolve with one lookup."""
+
+    def __init__(self, resolver: 'NameResolver'):
+        self.resolver = resolver
+        self.user_ids = set()
+
+    def add(self, *user_ids: Optional[str]):
+        self.user_ids.update(user_id for user_id in user_ids if user_id)
+
+    async def resolve(self) -> Dict[str, str]:
+        return await self.resolver.resolve_many(self.user_ids)
+
+class NameResolver:
+    """Resolves user ids to display names through a shared LRU+TTL cache.
+
+    Cache misses are fetched with a single ``$in`` per call. Unknown users are
+    cached as '' so repeated lookups for deleted accounts stay cheap.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.names = TTLCache(maxsize, ttl)
+        self.lookups = 0
+
+    def batch(self) -> NameBatch:
+        return NameBatch(self)
+
+    def prime(self, user_id: Optional[str], full_name: Optional[str]):
+        """Store a name that was already read alongside other data."""
+        if user_id and full_name is not None:
+            self.names.set(user_id, full_name)
+
+    async def resolve_many(self, user_ids) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        missing = []
+        for user_id in set(user_ids):
+            if not user_id:
+                continue
+            name = self.names.get(user_id)
+            if name is None:
+                missing.append(user_id)
+            elif name:
+                found[user_id] = name
+        
+        if missing:
+            self.lookups += 1
+            users = await db.users.find(
+                {'id': {'$in': missing}},
+                {'_id': 0, 'id': 1, 'full_name': 1}
+            ).to_list(len(missing))
+            fetched = {user['id']: user['full_name'] for user in users}
+            for user_id in missing:
+                self.names.set(user_id, fetched.get(user_id, ''))
+            found.update(fetched)
+        return found
+
+    async def resolve(self, user_id: Optional[str]) -> Optional[str]:
+        if not user_id:
+            return None
+        return (await self.resolve_many([user_id])).get(user_id)
+
+    def invalidate(self, user_id: str):
+        self.names.pop(user_id)
+
+    def stats(self) -> Dict[str, int]:
+        return {**self.names.stats(), 'lookups': self.lookups}
+
+name_resolver = NameResolver(NAME_CACHE_SIZE, NAME_CACHE_TTL_SECONDS)
+
+def invalidate_user_profile(user_id: str):
+    """Call whenever a user's profile (name, email, ...) changes."""
+    principal_cache.invalidate_user(user_id)
+    name_resolver.invalidate(user_id)
+
+# (user_id, org_id) -> role, or NOT_A_MEMBER for negative entries
+role_cache = TTLCache(ROLE_CACHE_SIZE, ROLE_CACHE_TTL_SECONDS)
+NOT_A_MEMBER = ''
+
+# org_id -> org version; writes in this process refresh it immediately
+org_version_cache = TTLCache(ORG_VERSION_CACHE_SIZE, ORG_VERSION_CACHE_TTL_SECONDS)
+
+class SingleFlight:
+    """Coalesces concurrent identical reads into one execution.
+
+    The first caller for a key starts the work as its own task; callers that
+    arrive while it is running await the same result. Nothing is kept once
+    the work finishes, so this only dedupes reads that overlap in time. The
+    work is shielded, so one client disconnecting does not cancel it for the
+    others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self.executed: Dict[str, int] = {}
+        self.coalesced: Dict[str, int] = {}
+
+    async def do(self, key: tuple, fn):
+        route = key[0]
+        task = self._inflight.get(key)
+        if task is None:
+            self.executed[route] = self.executed.get(route, 0) + 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self.coalesced[route] = self.coalesced.get(route, 0) + 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key: tuple, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # retrieved here in case every waiter went away
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'in_flight': len(self._inflight),
+            'routes': {
+                route: {'executed': executed, 'coalesced': self.coalesced.get(route, 0)}
+                for route, executed in self.executed.items()
+            }
+        }
+
+# (route, org_id, org version, role, params...) -> in-flight read
+read_flights = SingleFlight()
+
 # ==================== AUTH UTILITIES ====================
 
 def hash_password(password: str) -> str:
@@ -140,6 +767,50 @@ def hash_password(password: str) -> str:
 def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
 
+class PasswordHasher:
+    """Runs bcrypt in a process pool so hashing never blocks the event loop.
+
+    At most ``workers + queue_size`` calls may be in flight; anything beyond
+    that is rejected with a 503 instead of piling up behind the pool.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._slots = asyncio.Semaphore(self.workers + self.queue_size)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    async def _run(self, fn, *args):
+        self.start()
+        if self._slots.locked():
+            raise HTTPException(
+                status_code=503,
+                detail="Server busy, please retry",
+                headers={'Retry-After': '1'}
+            )
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(hash_password, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(verify_password, password, hashed)
+
+password_hasher = PasswordHasher(PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_SIZE)
+
 def create_access_token(user_id: str) -> str:
     payload = {
         'user_id': user_id,
@@ -150,24 +821,50 @@ def create_access_token(user_id: str) -> str:
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     try:
         token = credentials.credentials
-        payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
-        user_id = payload.get('user_id')
+        token_key = PrincipalCache.token_key(token)
+        cached_token = principal_cache.tokens.get(token_key)
+        if cached_token:
+            user_id, exp = cached_token
+            if exp is not None and exp <= time.time():
+                principal_cache.tokens.pop(token_key)
+                raise jwt.ExpiredSignatureError()
+        else:
+            payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALGORITHM])
+            user_id = payload.get('user_id')
+            principal_cache.tokens.set(token_key, (user_id, payload.get('exp')))
         
-        user = await db.users.find_one({'id': user_id}, {'_id': 0})
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        return user
+        user = principal_cache.users.get(user_id)
+        if user is None:
+            user = await db.users.find_one({'id': user_id}, {'_id': 0, 'password_hash': 0})
+            if not user:
+                raise HTTPException(status_code=401, detail="User not found")
+            principal_cache.users.set(user_id, user)
+        return dict(user)
     except jwt.ExpiredSignatureError:
         raise HTTPException(status_code=401, detail="Token expired")
     except Exception as e:
         raise HTTPException(status_code=401, detail="Invalid token")
 
 async def get_user_org_role(user_id: str, org_id: str) -> Optional[str]:
+    key = (user_id, org_id)
+    cached = role_cache.get(key)
+    if cached is not None:
+        return cached or None
+    
     member = await db.organization_members.find_one(
         {'user_id': user_id, 'org_id': org_id},
-        {'_id': 0}
+        {'_id': 0, 'role': 1}
     )
-    return member['role'] if member else None
+    if member:
+        role_cache.set(key, member['role'])
+        return member['role']
+    
+    role_cache.set(key, NOT_A_MEMBER, ttl=ROLE_CACHE_NEGATIVE_TTL_SECONDS)
+    return None
+
+def invalidate_user_org_role(user_id: str, org_id: str):
+    """Call whenever a membership is created, changed or removed."""
+    role_cache.pop((user_id, org_id))
 
 async def require_role(user, org_id: str, allowed_roles: List[str]):
     role = await get_user_org_role(user['id'], org_id)
@@ -176,8 +873,12 @@ async def require_role(user, org_id: str, allowed_roles: List[str]):
     return role
 
 async def require_sys_admin(user):
-    admin_user = await db.sys_admins.find_one({'user_id': user['id']}, {'_id': 0})
-    if not admin_user:
+    is_admin = principal_cache.sys_admins.get(user['id'])
+    if is_admin is None:
+        admin_user = await db.sys_admins.find_one({'user_id': user['id']}, {'_id': 0, 'user_id': 1})
+        is_admin = admin_user is not None
+        principal_cache.sys_admins.set(user['id'], is_admin)
+    if not is_admin:
         raise HTTPException(status_code=403, detail="System admin access required")
 
 # ==================== AUTH ROUTES ====================
@@ -193,12 +894,16 @@ async def register(user_data: UserCreate):
     user_doc = {
         'id': user_id,
         'email': user_data.email,
-        'password_hash': hash_password(user_data.password),
+        'password_hash': await password_hasher.hash(user_data.password),
         'full_name': user_data.full_name,
         'created_at': datetime.now(timezone.utc).isoformat()
     }
     
-    await db.users.insert_one(user_doc)
+    # The unique email index catches a concurrent registration that passed the check above
+    try:
+        await db.users.insert_one(user_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="Email already registered")
     
     token = create_access_token(user_id)
     
@@ -215,7 +920,7 @@ async def register(user_data: UserCreate):
 @api_router.post("/auth/login", response_model=TokenResponse)
 async def login(credentials: UserLogin):
     user = await db.users.find_one({'email': credentials.email}, {'_id': 0})
-    if not user or not verify_password(credentials.password, user['password_hash']):
+    if not user or not await password_hasher.verify(credentials.password, user['password_hash']):
         raise HTTPException(status_code=401, detail="Invalid credentials")
     
     token = create_access_token(user['id'])
@@ -239,6 +944,80 @@ async def get_me(current_user = Depends(get_current_user)):
         created_at=current_user['created_at']
     )
 
+# ==================== ORG VERSIONS ====================
+
+# Every successful task and membership write bumps its org's counter in
+# org_counters, which feeds the ETags of org-scoped reads. The bump follows
+# the write, so a reader never pairs a new version with data that predates
+# it. Task documents carry their own stamp from next_task_version, which
+# drives delta sync.
+
+_last_task_version = 0
+
+def next_task_version() -> int:
+    """Version stamp for a task write: microseconds since the epoch, strictly
+    increasing within this process.
+
+    Stamps are taken before the write lands, so a stamp can become visible
+    after a later one; get_task_changes allows for that with an overlap window.
+    """
+    global _last_task_version
+    _last_task_version = max(_last_task_version + 1, time.time_ns() // 1000)
+    return _last_task_version
+
+async def next_org_version(org_id: str) -> int:
+    """Bump the org's change counter and return the new value."""
+    counter = await db.org_counters.find_one_and_update(
+        {'_id': org_id},
+        {'$inc': {'version': 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    org_version_cache.set(org_id, counter['version'])
+    return counter['version']
+
+async def get_org_version(org_id: str) -> int:
+    counter = await db.org_counters.find_one({'_id': org_id})
+    return counter['version'] if counter else 0
+
+async def get_cached_org_version(org_id: str) -> int:
+    version = org_version_cache.get(org_id)
+    if version is None:
+        version = await get_org_version(org_id)
+        org_version_cache.set(org_id, version)
+    return version
+
+def org_etag(request: Request, version: int, user_id: str) -> str:
+    """Weak ETag for an org-scoped read: the org version plus what shaped the payload."""
+    params = '&'.join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    representation = 'msgpack' if wants_msgpack(request) else 'json'
+    variant = hashlib.sha1(f"{request.url.path}?{params}|{user_id}|{representation}".encode('utf-8')).hexdigest()[:16]
+    return f'W/"{version}-{variant}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate.startswith('W/'):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+async def check_not_modified(request: Request, response: Response, org_id: str, user_id: str, cache_control: str) -> Optional[Response]:
+    """Return a 304 if the client's copy is current, else stamp ETag/Cache-Control on ``response``."""
+    etag = org_etag(request, await get_cached_org_version(org_id), user_id)
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers={'ETag': etag, 'Cache-Control': cache_control})
+    response.headers['ETag'] = etag
+    response.headers['Cache-Control'] = cache_control
+    return None
+
+
 # ==================== ORGANIZATION ROUTES ====================
 
 @api_router.post("/organizations", response_model=OrganizationResponse)
@@ -264,11 +1043,13 @@ async def create_organization(org_data: OrganizationCreate, current_user = Depen
         'created_at': datetime.now(timezone.utc).isoformat()
     }
     await db.organization_members.insert_one(member_doc)
+    invalidate_user_org_role(current_user['id'], org_id)
+    await next_org_version(org_id)
     
     return OrganizationResponse(**org_doc)
 
 @api_router.get("/organizations", response_model=List[OrganizationResponse])
-async def get_my_organizations(current_user = Depends(get_current_user)):
+async def get_my_organizations(request: Request, response: Response, current_user = Depends(get_current_user)):
     members = await db.organization_members.find(
         {'user_id': current_user['id']},
         {'_id': 0}
@@ -280,7 +1061,7 @@ async def get_my_organizations(current_user = Depends(get_current_user)):
         {'_id': 0}
     ).to_list(100)
     
-    return [OrganizationResponse(**org) for org in orgs]
+    return typed_response(request, response, OrganizationListAdapter, OrganizationListAdapter.validate_python(orgs))
 
 @api_router.get("/organizations/{org_id}", response_model=OrganizationResponse)
 async def get_organization(org_id: str, current_user = Depends(get_current_user)):
@@ -319,54 +1100,280 @@ async def invite_member(org_id: str, invite: OrganizationMemberInvite, current_u
         'role': invite.role,
         'created_at': datetime.now(timezone.utc).isoformat()
     }
-    await db.organization_members.insert_one(member_doc)
+    try:
+        await db.organization_members.insert_one(member_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="User already a member")
+    invalidate_user_org_role(invited_user['id'], org_id)
+    await next_org_version(org_id)
     
     return {"message": "Member invited successfully"}
 
 @api_router.get("/organizations/{org_id}/members")
-async def get_organization_members(org_id: str, current_user = Depends(get_current_user)):
+async def get_organization_members(
+    org_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
     role = await get_user_org_role(current_user['id'], org_id)
     if not role:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
+    selected = parse_fields(fields, MEMBER_FIELDS) or MEMBER_FIELDS
+    not_modified = await check_not_modified(request, response, org_id, current_user['id'], 'private, no-cache')
+    if not_modified:
+        return not_modified
+    
+    member_projection = {'_id': 0, 'user_id': 1}
+    member_projection.update({f: 1 for f in selected if f in ('id', 'role', 'created_at')})
     members = await db.organization_members.find(
         {'org_id': org_id},
-        {'_id': 0}
+        member_projection
     ).to_list(100)
     
+    user_map = None
     user_ids = [m['user_id'] for m in members]
-    users = await db.users.find(
-        {'id': {'$in': user_ids}},
-        {'_id': 0, 'password_hash': 0}
-    ).to_list(100)
-    
-    user_map = {u['id']: u for u in users}
+    if 'email' in selected:
+        users = await db.users.find(
+            {'id': {'$in': user_ids}},
+            {'_id': 0, 'id': 1, 'email': 1, 'full_name': 1}
+        ).to_list(len(user_ids))
+        user_map = {u['id']: u for u in users}
+        for user in users:
+            name_resolver.prime(user['id'], user.get('full_name'))
+    elif 'full_name' in selected:
+        names = await name_resolver.resolve_many(user_ids)
+        user_map = {user_id: {'full_name': name} for user_id, name in names.items()}
     
     result = []
     for member in members:
-        user = user_map.get(member['user_id'])
-        if user:
-            result.append({
-                'id': member['id'],
-                'user_id': member['user_id'],
-                'email': user['email'],
-                'full_name': user['full_name'],
-                'role': member['role'],
-                'created_at': member['created_at']
-            })
+        row = dict(member)
+        if user_map is not None:
+            user = user_map.get(member['user_id'])
+            if not user:
+                continue
+            # Only the profile fields: the user's own 'id' must not replace the membership id
+            row.update({f: user[f] for f in ('email', 'full_name') if f in user})
+        result.append({f: row.get(f) for f in selected})
     
     return result
 
-# ==================== TASK ROUTES ====================
+# ==================== LIVE TASK FEED ====================
 
-@api_router.post("/organizations/{org_id}/tasks", response_model=TaskResponse)
-async def create_task(org_id: str, task_data: TaskCreate, current_user = Depends(get_current_user)):
-    # Admin and Manager can create tasks
-    await require_role(current_user, org_id, ['admin', 'manager'])
+def watch_task_changes(resume_after: Optional[dict]):
+    """Change stream over task writes and delete tombstones for every org."""
+    pipeline = [{'$match': {
+        'ns.coll': {'$in': ['tasks', 'task_tombstones']},
+        'operationType': {'$in': ['insert', 'update', 'replace']}
+    }}]
+    return db.watch(pipeline, full_document='updateLookup', resume_after=resume_after)
+
+def task_event_from_change(change: dict):
+    """Map a change event to (event_id, org_id, payload), or None to skip it."""
+    doc = change.get('fullDocument')
+    if not doc:
+        # updateLookup finds nothing when the task was deleted in the meantime
+        return None
+    event_id = change['_id']['_data']
+    if change['ns']['coll'] == 'task_tombstones':
+        return event_id, doc['org_id'], {'type': 'delete', 'task_id': doc['task_id'], 'version': doc['version']}
+    task = {k: v for k, v in doc.items() if k != '_id'}
+    return event_id, doc['org_id'], {'type': 'upsert', 'task': task}
+
+class TaskEventHub:
+    """Fans a single change stream out to every SSE subscriber in this process.
+
+    ``source(resume_after)`` returns an async iterable of change events, so the
+    hub runs equally well on a MongoDB change stream or an in-memory feed.
+    Recent events are kept so a reconnecting client can resume from its
+    Last-Event-ID. The stream keeps running for ``idle_grace`` seconds after
+    the last subscriber leaves, so a lone client that reconnects can still
+    resume; after that the replay buffer is dropped. A client that is too far
+    behind gets a ``reset`` event and must reload.
+    """
+
+    RESET = (None, {'type': 'reset'})
+
+    def __init__(self, source, queue_size: int, replay_size: int, idle_grace: float):
+        self.source = source
+        self.queue_size = queue_size
+        self.idle_grace = idle_grace
+        self._subscribers: Dict[str, set] = {}
+        self._recent: deque = deque(maxlen=replay_size)
+        self._resume_token: Optional[dict] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._idle_timer: Optional[asyncio.TimerHandle] = None
+
+    def subscribe(self, org_id: str, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        queue = asyncio.Queue(self.queue_size)
+        if last_event_id:
+            replay = self._events_after(org_id, last_event_id)
+            if replay is None or len(replay) >= self.queue_size:
+                queue.put_nowait(self.RESET)
+            else:
+                for event in replay:
+                    queue.put_nowait(event)
+        
+        self._subscribers.setdefault(org_id, set()).add(queue)
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, org_id: str, queue: asyncio.Queue):
+        queues = self._subscribers.get(org_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[org_id]
+        if not self._subscribers and self._runner is not None and self._idle_timer is None:
+            self._idle_timer = asyncio.get_running_loop().call_later(self.idle_grace, self._stop_if_idle)
+
+    def _stop_if_idle(self):
+        self._idle_timer = None
+        if self._subscribers or self._runner is None:
+            return
+        # Nobody came back: stop tailing and forget what we can no longer resume
+        self._runner.cancel()
+        self._runner = None
+        self._resume_token = None
+        self._recent.clear()
+
+    def publish(self, event_id: str, org_id: str, payload: dict):
+        self._recent.append((event_id, org_id, payload))
+        for queue in list(self._subscribers.get(org_id, ())):
+            try:
+                queue.put_nowait((event_id, payload))
+            except asyncio.QueueFull:
+                # A slow client must resync rather than hold up everyone else
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self.RESET)
+                self._subscribers[org_id].discard(queue)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def _events_after(self, org_id: str, event_id: str) -> Optional[list]:
+        events = list(self._recent)
+        for position, (recent_id, _, _) in enumerate(events):
+            if recent_id == event_id:
+                return [(eid, payload) for eid, oid, payload in events[position + 1:] if oid == org_id]
+        return None
+
+    async def _run(self):
+        delay = 1
+        while True:
+            stream = None
+            try:
+                stream = self.source(self._resume_token)
+                async for change in stream:
+                    self._resume_token = change['_id']
+                    event = task_event_from_change(change)
+                    if event:
+                        self.publish(*event)
+                    delay = 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task change stream interrupted: {e}")
+            finally:
+                if stream is not None and hasattr(stream, 'close'):
+                    await stream.close()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 30)
+
+    async def close(self):
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        if self._runner is not None:
+            self._runner.cancel()
+            self._runner = None
+
+task_event_hub = TaskEventHub(
+    watch_task_changes, TASK_STREAM_QUEUE_SIZE, TASK_STREAM_REPLAY_SIZE, TASK_STREAM_IDLE_GRACE_SECONDS
+)
+
+async def stream_task_events(request: Request, org_id: str, queue: asyncio.Queue):
+    try:
+        while True:
+            try:
+                event_id, payload = await asyncio.wait_for(queue.get(), TASK_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ': keepalive\n\n'
+                continue
+            
+            data = json.dumps(payload, default=str, separators=(',', ':'))
+            header = f"id: {event_id}\n" if event_id else ''
+            yield f"{header}event: {payload['type']}\ndata: {data}\n\n"
+            if payload['type'] == 'reset':
+                break
+    finally:
+        task_event_hub.unsubscribe(org_id, queue)
+
+@api_router.get("/organizations/{org_id}/tasks/stream")
+async def stream_tasks(
+    org_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    current_user = Depends(get_current_user)
+):
+    role = await get_user_org_role(current_user['id'], org_id)
+    if not role:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    task_id = str(uuid.uuid4())
-    task_doc = {
-        'id': task_id,
+    queue = task_event_hub.subscribe(org_id, last_event_id)
+    return StreamingResponse(
+        stream_task_events(request, org_id, queue),
+        media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+# ==================== TASK ROUTES ====================
+
+async def record_task_tombstones(org_id: str, task_ids: List[str], version: int):
+    if not task_ids:
+        return
+    deleted_at = datetime.now(timezone.utc)
+    await db.task_tombstones.insert_many([
+        {'org_id': org_id, 'task_id': task_id, 'version': version, 'deleted_at': deleted_at}
+        for task_id in task_ids
+    ])
+
+async def backfill_task_versions() -> int:
+    """Stamp tasks written before versioning so If-Match and delta sync see them."""
+    result = await db.tasks.update_many(
+        {'version': {'$exists': False}},
+        {'$set': {'version': next_task_version()}}
+    )
+    await db.tasks.update_many(
+        {'updated_at': {'$exists': False}},
+        [{'$set': {'updated_at': '$created_at'}}]
+    )
+    return result.modified_count
+
+def parse_if_match(value: Optional[str]) -> Optional[int]:
+    if value is None:
+        return None
+    value = value.strip()
+    if value.startswith('W/'):
+        value = value[2:]
+    try:
+        return int(value.strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="If-Match must be a task version")
+
+def build_task_doc(org_id: str, task_data: TaskCreate, created_by: str, version: int) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {
+        'id': str(uuid.uuid4()),
         'org_id': org_id,
         'title': task_data.title,
         'description': task_data.description,
@@ -375,32 +1382,206 @@ async def create_task(org_id: str, task_data: TaskCreate, current_user = Depends
         'duration_minutes': task_data.duration_minutes,
         'is_daily': task_data.is_daily,
         'due_date': task_data.due_date,
-        'created_by': current_user['id'],
-        'created_at': datetime.now(timezone.utc).isoformat()
+        'created_by': created_by,
+        'created_at': now,
+        'updated_at': now,
+        'version': version
     }
+
+def format_validation_error(error: ValidationError) -> str:
+    return '; '.join(
+        f"{'.'.join(str(part) for part in err['loc']) or 'body'}: {err['msg']}"
+        for err in error.errors()
+    )
+
+@api_router.post("/organizations/{org_id}/tasks/bulk")
+async def bulk_create_tasks(org_id: str, items: List[dict], current_user = Depends(get_current_user)):
+    # Admin and Manager can create tasks
+    await require_role(current_user, org_id, ['admin', 'manager'])
+    
+    if len(items) > BULK_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} tasks per request")
+    
+    results: List[Optional[dict]] = [None] * len(items)
+    valid = []
+    for index, item in enumerate(items):
+        try:
+            valid.append((index, TaskCreate.model_validate(item)))
+        except ValidationError as e:
+            results[index] = {'index': index, 'error': format_validation_error(e)}
+    
+    docs = []
+    doc_indexes = []
+    if valid:
+        for index, task_data in valid:
+            docs.append(build_task_doc(org_id, task_data, current_user['id'], next_task_version()))
+            doc_indexes.append(index)
+    
+    failed = {}
+    if docs:
+        try:
+            await db.tasks.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            failed = {err['index']: err.get('errmsg', 'Write failed') for err in e.details.get('writeErrors', [])}
+        if len(failed) < len(docs):
+            await next_org_version(org_id)
+    
+    names = name_resolver.batch()
+    names.add(*(d.get('assigned_to') for d in docs))
+    user_map = await names.resolve()
+    
+    for position, (index, doc) in enumerate(zip(doc_indexes, docs)):
+        if position in failed:
+            results[index] = {'index': index, 'error': failed[position]}
+            continue
+        doc.pop('_id', None)
+        results[index] = {
+            'index': index,
+            'task': TaskResponse(**doc, assigned_to_name=user_map.get(doc.get('assigned_to')))
+        }
+    
+    created = sum(1 for r in results if 'task' in r)
+    return {'created': created, 'failed': len(results) - created, 'results': results}
+
+def build_bulk_task_query(org_id: str, selector: TaskBulkSelector) -> dict:
+    query = {'org_id': org_id}
+    if selector.ids is not None:
+        if len(selector.ids) > BULK_MAX_ITEMS:
+            raise HTTPException(status_code=400, detail=f"At most {BULK_MAX_ITEMS} ids per request")
+        query['id'] = {'$in': selector.ids}
+    for field in ('status', 'assigned_to', 'is_daily'):
+        value = getattr(selector, field)
+        if value is not None:
+            query[field] = value
+    if len(query) == 1:
+        raise HTTPException(status_code=400, detail="Provide ids or at least one filter")
+    return query
+
+@api_router.patch("/organizations/{org_id}/tasks/bulk")
+async def bulk_update_tasks(org_id: str, bulk: TaskBulkUpdate, current_user = Depends(get_current_user)):
+    role = await require_role(current_user, org_id, ['admin', 'manager', 'employee'])
+    
+    query = build_bulk_task_query(org_id, bulk)
+    # Employees can only update their own tasks
+    if role == 'employee':
+        if query.get('assigned_to', current_user['id']) != current_user['id']:
+            raise HTTPException(status_code=403, detail="Can only update your own tasks")
+        query['assigned_to'] = current_user['id']
+    
+    update_data = {k: v for k, v in bulk.update.model_dump().items() if v is not None}
+    if not update_data:
+        raise HTTPException(status_code=400, detail="No fields to update")
+    
+    update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+    update_data['version'] = next_task_version()
+    result = await db.tasks.update_many(query, {'$set': update_data})
+    if result.modified_count:
+        await next_org_version(org_id)
+    
+    return {'matched_count': result.matched_count, 'modified_count': result.modified_count}
+
+@api_router.delete("/organizations/{org_id}/tasks/bulk")
+async def bulk_delete_tasks(org_id: str, selector: TaskBulkSelector, current_user = Depends(get_current_user)):
+    # Only admin and manager can delete
+    await require_role(current_user, org_id, ['admin', 'manager'])
+    
+    query = build_bulk_task_query(org_id, selector)
+    
+    # A filter can match any number of tasks: delete them in id order, one
+    # bounded batch at a time, so no command carries an unbounded $in
+    deleted_count = 0
+    batch_query = query
+    while True:
+        matched = await db.tasks.find(batch_query, {'_id': 0, 'id': 1}).sort('id', 1).limit(BULK_MAX_ITEMS).to_list(BULK_MAX_ITEMS)
+        task_ids = [t['id'] for t in matched]
+        if not task_ids:
+            break
+        
+        version = next_task_version()
+        result = await db.tasks.delete_many({'org_id': org_id, 'id': {'$in': task_ids}})
+        await record_task_tombstones(org_id, task_ids, version)
+        deleted_count += result.deleted_count
+        if len(task_ids) < BULK_MAX_ITEMS:
+            break
+        batch_query = {'$and': [query, {'id': {'$gt': task_ids[-1]}}]}
+    
+    if deleted_count:
+        await next_org_version(org_id)
+    
+    return {'deleted_count': deleted_count}
+
+@api_router.post("/organizations/{org_id}/tasks", response_model=TaskResponse)
+async def create_task(org_id: str, task_data: TaskCreate, current_user = Depends(get_current_user)):
+    # Admin and Manager can create tasks
+    await require_role(current_user, org_id, ['admin', 'manager'])
+    
+    task_doc = build_task_doc(org_id, task_data, current_user['id'], next_task_version())
     
     await db.tasks.insert_one(task_doc)
+    await next_org_version(org_id)
     
-    assigned_to_name = None
-    if task_data.assigned_to:
-        assigned_user = await db.users.find_one({'id': task_data.assigned_to}, {'_id': 0})
-        if assigned_user:
-            assigned_to_name = assigned_user['full_name']
+    assigned_to_name = await name_resolver.resolve(task_data.assigned_to)
     
     return TaskResponse(**task_doc, assigned_to_name=assigned_to_name)
 
+# Joins each task to its assignee's full_name inside the read, saving a users query.
+# Chosen over copying the name onto tasks: a rename then touches one user
+# document instead of every task assigned to it, names are never stale, and
+# each join is a point lookup on the unique users.id index over a page of
+# tasks. bench_assignee_names.py measures both shapes against a deployment.
+ASSIGNEE_NAME_STAGES = [
+    {'$lookup': {
+        'from': 'users',
+        'localField': 'assigned_to',
+        'foreignField': 'id',
+        # Only the name crosses over, never password_hash or email
+        'pipeline': [{'$project': {'_id': 0, 'full_name': 1}}],
+        'as': 'assignee'
+    }},
+    {'$addFields': {'assigned_to_name': {'$arrayElemAt': ['$assignee.full_name', 0]}}},
+    {'$project': {'assignee': 0}}
+]
+
+# Task lists are ordered by (created_at, id); a cursor is the last seen pair
+TASK_SORT = [('created_at', 1), ('id', 1)]
+
+def encode_task_cursor(task: dict) -> str:
+    raw = json.dumps([task['created_at'], task['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_task_cursor(cursor: str) -> dict:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, task_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return {'$or': [
+        {'created_at': {'$gt': created_at}},
+        {'created_at': created_at, 'id': {'$gt': task_id}}
+    ]}
+
 @api_router.get("/organizations/{org_id}/tasks", response_model=List[TaskResponse])
 async def get_tasks(
     org_id: str,
+    request: Request,
+    response: Response,
     status: Optional[str] = None,
     assigned_to_me: bool = False,
     is_daily: Optional[bool] = None,
+    limit: int = Query(TASK_PAGE_SIZE, ge=1, le=TASK_PAGE_SIZE_MAX),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     current_user = Depends(get_current_user)
 ):
     role = await get_user_org_role(current_user['id'], org_id)
     if not role:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
+    selected = parse_fields(fields, TASK_FIELDS)
+    not_modified = await check_not_modified(request, response, org_id, current_user['id'], 'private, no-cache')
+    if not_modified:
+        return not_modified
+    
     query = {'org_id': org_id}
     
     if status:
@@ -412,73 +1593,241 @@ async def get_tasks(
     if is_daily is not None:
         query['is_daily'] = is_daily
     
-    tasks = await db.tasks.find(query, {'_id': 0}).to_list(1000)
+    if cursor:
+        query.update(decode_task_cursor(cursor))
+    
+    async def load_page():
+        # Fetch one extra task to learn whether another page follows
+        pipeline = [
+            {'$match': query},
+            {'$sort': dict(TASK_SORT)},
+            {'$limit': limit + 1},
+            {'$project': task_projection(selected, required=('created_at', 'id'))}
+        ]
+        if selected is None or 'assigned_to_name' in selected:
+            pipeline += ASSIGNEE_NAME_STAGES
+        
+        tasks = await db.tasks.aggregate(pipeline).to_list(limit + 1)
+        for task in tasks:
+            name_resolver.prime(task.get('assigned_to'), task.get('assigned_to_name'))
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = encode_task_cursor(tasks[-1])
+        
+        adapter = TaskListAdapter if selected is None else task_fields_adapter(selected)
+        return next_cursor, *typed_body(request, adapter, adapter.validate_python(tasks))
+    
+    # The Mongo query already folds in the cursor and assigned_to_me's user id
+    key = (
+        'tasks', org_id, await get_cached_org_version(org_id), role,
+        json.dumps(query, sort_keys=True), limit,
+        tuple(sorted(selected)) if selected is not None else None,
+        wants_msgpack(request)
+    )
+    next_cursor, content, media_type = await read_flights.do(key, load_page)
+    if next_cursor:
+        response.headers['X-Next-Cursor'] = next_cursor
+    return body_response(response, content, media_type)
+
+@api_router.get("/organizations/{org_id}/tasks/changes", response_model=TaskChangesResponse)
+async def get_task_changes(
+    org_id: str,
+    request: Request,
+    response: Response,
+    since: int = Query(..., ge=0),
+    current_user = Depends(get_current_user)
+):
+    """Tasks changed and ids deleted after version ``since``.
+
+    The returned ``version`` is the ``since`` for the next poll. It trails the
+    clock by TASK_DELTA_OVERLAP_SECONDS: a write stamped just before this read
+    may not have landed yet, so changes inside that window are sent again on
+    the next poll. Clients apply changes by task id, so repeats are harmless.
+
+    ``reset`` tells the client to reload the full list because too much changed.
+    Tombstones expire after TOMBSTONE_TTL_DAYS, so clients idle for longer
+    should reload as well.
+    """
+    role = await get_user_org_role(current_user['id'], org_id)
+    if not role:
+        raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    # Get all assigned user names
-    assigned_ids = [t['assigned_to'] for t in tasks if t.get('assigned_to')]
-    if assigned_ids:
-        users = await db.users.find(
-            {'id': {'$in': assigned_ids}},
+    version = max(since, time.time_ns() // 1000 - int(TASK_DELTA_OVERLAP_SECONDS * 1_000_000))
+    tasks, tombstones = await asyncio.gather(
+        db.tasks.find(
+            {'org_id': org_id, 'version': {'$gt': since}},
             {'_id': 0}
-        ).to_list(100)
-        user_map = {u['id']: u['full_name'] for u in users}
-    else:
-        user_map = {}
+        ).sort('version', 1).to_list(TASK_DELTA_MAX + 1),
+        db.task_tombstones.find(
+            {'org_id': org_id, 'version': {'$gt': since}},
+            {'_id': 0, 'task_id': 1}
+        ).to_list(TASK_DELTA_MAX + 1)
+    )
+    if len(tasks) > TASK_DELTA_MAX or len(tombstones) > TASK_DELTA_MAX:
+        return TaskChangesResponse(version=version, reset=True, tasks=[], deleted=[])
+    
+    names = name_resolver.batch()
+    names.add(*(t.get('assigned_to') for t in tasks))
+    user_map = await names.resolve()
     
-    result = []
     for task in tasks:
-        result.append(TaskResponse(
-            **task,
-            assigned_to_name=user_map.get(task.get('assigned_to'))
-        ))
+        task['assigned_to_name'] = user_map.get(task.get('assigned_to'))
+    
+    changes = TaskChangesResponse.model_validate({
+        'version': version,
+        'reset': False,
+        'tasks': tasks,
+        'deleted': [t['task_id'] for t in tombstones]
+    })
+    return typed_response(request, response, TaskChangesAdapter, changes)
+
+EXPORT_FIELDS = list(TaskResponse.model_fields)
+
+async def iter_task_batches(query: dict, batch_size: int):
+    batch = []
+    async for task in db.tasks.find(query, {'_id': 0}).sort(TASK_SORT).batch_size(batch_size):
+        batch.append(task)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+async def iter_export_rows(query: dict):
+    """Yield export rows batch by batch, resolving names through the shared name cache."""
+    async for batch in iter_task_batches(query, EXPORT_BATCH_SIZE):
+        names = name_resolver.batch()
+        names.add(*(t.get('assigned_to') for t in batch))
+        user_map = await names.resolve()
+        
+        rows = []
+        for task in batch:
+            row = {field: task.get(field) for field in EXPORT_FIELDS}
+            row['assigned_to_name'] = user_map.get(task.get('assigned_to'))
+            rows.append(row)
+        yield rows
+
+async def stream_ndjson(query: dict):
+    async for rows in iter_export_rows(query):
+        yield ''.join(json.dumps(row, separators=(',', ':')) + '\n' for row in rows)
+
+async def stream_csv(query: dict):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    writer.writeheader()
+    async for rows in iter_export_rows(query):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@api_router.get("/organizations/{org_id}/tasks/export")
+async def export_tasks(
+    org_id: str,
+    request: Request,
+    format: str = Query('ndjson', pattern='^(ndjson|csv)$'),
+    status: Optional[str] = None,
+    current_user = Depends(get_current_user)
+):
+    # Admin and manager can export
+    await require_role(current_user, org_id, ['admin', 'manager'])
     
-    return result
+    query = {'org_id': org_id}
+    if status:
+        query['status'] = status
+    
+    if format == 'csv':
+        body, media_type = stream_csv(query), 'text/csv'
+    else:
+        body, media_type = stream_ndjson(query), 'application/x-ndjson'
+    
+    headers = {'Content-Disposition': f'attachment; filename="tasks-{org_id}.{format}"'}
+    # Compress whole batches here rather than per message in the middleware
+    encoding = choose_encoding(request.headers.get('accept-encoding', ''))
+    if encoding:
+        body = compress_stream(body, encoding)
+        headers['Content-Encoding'] = encoding
+        headers['Vary'] = 'Accept-Encoding'
+    
+    return StreamingResponse(body, media_type=media_type, headers=headers)
 
 @api_router.get("/organizations/{org_id}/tasks/{task_id}", response_model=TaskResponse)
-async def get_task(org_id: str, task_id: str, current_user = Depends(get_current_user)):
+async def get_task(org_id: str, task_id: str, response: Response, current_user = Depends(get_current_user)):
     role = await get_user_org_role(current_user['id'], org_id)
     if not role:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    task = await db.tasks.find_one({'id': task_id, 'org_id': org_id}, {'_id': 0})
-    if not task:
+    tasks = await db.tasks.aggregate([
+        {'$match': {'id': task_id, 'org_id': org_id}},
+        {'$limit': 1},
+        {'$project': {'_id': 0}},
+        *ASSIGNEE_NAME_STAGES
+    ]).to_list(1)
+    if not tasks:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    assigned_to_name = None
-    if task.get('assigned_to'):
-        assigned_user = await db.users.find_one({'id': task['assigned_to']}, {'_id': 0})
-        if assigned_user:
-            assigned_to_name = assigned_user['full_name']
-    
-    return TaskResponse(**task, assigned_to_name=assigned_to_name)
+    task = tasks[0]
+    name_resolver.prime(task.get('assigned_to'), task.get('assigned_to_name'))
+    response.headers['ETag'] = f'"{task.get("version", 0)}"'
+    return TaskResponse(**task)
 
 @api_router.patch("/organizations/{org_id}/tasks/{task_id}", response_model=TaskResponse)
-async def update_task(org_id: str, task_id: str, task_update: TaskUpdate, current_user = Depends(get_current_user)):
-    task = await db.tasks.find_one({'id': task_id, 'org_id': org_id}, {'_id': 0})
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
+async def update_task(
+    org_id: str,
+    task_id: str,
+    task_update: TaskUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    current_user = Depends(get_current_user)
+):
+    update_data = {k: v for k, v in task_update.model_dump().items() if v is not None}
+    expected_version = parse_if_match(if_match)
     
-    # Admin and manager can update any task, employee can update their own tasks
+    # Usually cached, so the write below is the first of two round trips;
+    # a cold role cache adds a third
     role = await get_user_org_role(current_user['id'], org_id)
-    if role not in ['admin', 'manager']:
-        if task.get('assigned_to') != current_user['id']:
-            raise HTTPException(status_code=403, detail="Can only update your own tasks")
     
-    update_data = {k: v for k, v in task_update.model_dump().items() if v is not None}
+    # Admin and manager can update any task, employee can update their own tasks
+    query = {'id': task_id, 'org_id': org_id}
+    if role not in ['admin', 'manager']:
+        query['assigned_to'] = current_user['id']
+    if expected_version is not None:
+        # An unversioned task reports version 0 until backfill_task_versions stamps it
+        query['version'] = expected_version or {'$in': [0, None]}
     
     if update_data:
-        await db.tasks.update_one(
-            {'id': task_id},
-            {'$set': update_data}
+        update_data['updated_at'] = datetime.now(timezone.utc).isoformat()
+        update_data['version'] = next_task_version()
+        task = await db.tasks.find_one_and_update(
+            query,
+            {'$set': update_data},
+            projection={'_id': 0},
+            return_document=ReturnDocument.AFTER
         )
-        task.update(update_data)
+    else:
+        task = await db.tasks.find_one(query, {'_id': 0})
+    
+    if not task:
+        # Only a failed update pays for this read, to report why nothing matched
+        existing = None
+        if len(query) > 2:
+            existing = await db.tasks.find_one({'id': task_id, 'org_id': org_id}, {'_id': 0, 'id': 1, 'assigned_to': 1})
+        if not existing:
+            raise HTTPException(status_code=404, detail="Task not found")
+        if 'assigned_to' in query and existing.get('assigned_to') != current_user['id']:
+            raise HTTPException(status_code=403, detail="Can only update your own tasks")
+        raise HTTPException(status_code=412, detail="Task was modified by someone else")
     
-    assigned_to_name = None
-    if task.get('assigned_to'):
-        assigned_user = await db.users.find_one({'id': task['assigned_to']}, {'_id': 0})
-        if assigned_user:
-            assigned_to_name = assigned_user['full_name']
+    # The version bump and the assignee's name are independent: one more round trip
+    _, assigned_to_name = await asyncio.gather(
+        next_org_version(org_id) if update_data else asyncio.sleep(0),
+        name_resolver.resolve(task.get('assigned_to'))
+    )
     
+    response.headers['ETag'] = f'"{task.get("version", 0)}"'
     return TaskResponse(**task, assigned_to_name=assigned_to_name)
 
 @api_router.delete("/organizations/{org_id}/tasks/{task_id}")
@@ -490,8 +1839,358 @@ async def delete_task(org_id: str, task_id: str, current_user = Depends(get_curr
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Task not found")
     
+    await record_task_tombstones(org_id, [task_id], next_task_version())
+    await next_org_version(org_id)
+    
     return {"message": "Task deleted successfully"}
 
+# ==================== STRIPE CLIENT ====================
+
+# Failures that say nothing about the request itself and may succeed if repeated
+STRIPE_TRANSIENT_ERRORS = (stripe.error.APIConnectionError, stripe.error.RateLimitError, stripe.error.APIError)
+
+class CircuitBreaker:
+    """Opens after ``threshold`` consecutive failures and fails fast until
+    ``reset_seconds`` have passed; then lets a single trial call through.
+    """
+
+    def __init__(self, threshold: int, reset_seconds: float):
+        self.threshold = max(1, threshold)
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_seconds:
+            return 'half_open'
+        return 'open'
+
+    def retry_after(self) -> int:
+        if self.opened_at is None:
+            return 0
+        return max(1, int(self.reset_seconds - (time.monotonic() - self.opened_at)) + 1)
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == 'closed':
+            return True
+        if state == 'half_open' and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._trial_running or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self._trial_running = False
+
+class StripeGateway:
+    """Runs blocking Stripe SDK calls on a dedicated, bounded thread pool.
+
+    Each attempt is capped at ``timeout`` seconds. Calls marked ``retry`` (safe,
+    idempotent reads) are retried with full jitter on transient failures.
+    A circuit breaker fails calls fast with a 503 while Stripe keeps failing,
+    and a full pool rejects with a 503 instead of queueing without bound.
+    """
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, retries: int,
+                 retry_base: float, breaker: CircuitBreaker):
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.retry_base = retry_base
+        self.breaker = breaker
+        self.counters = {'calls': 0, 'retries': 0, 'timeouts': 0, 'failures': 0, 'rejected': 0}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def start(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='stripe')
+            self._slots = asyncio.Semaphore(self.workers + self.queue_size)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._slots = None
+
+    def _reject(self, detail: str, retry_after: int):
+        self.counters['rejected'] += 1
+        raise HTTPException(status_code=503, detail=detail, headers={'Retry-After': str(retry_after)})
+
+    def _settle(self, future: asyncio.Future):
+        # Runs when the worker thread is actually done, even if nobody is waiting anymore
+        if self._slots is not None:
+            self._slots.release()
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is None or (isinstance(error, stripe.error.StripeError) and not isinstance(error, STRIPE_TRANSIENT_ERRORS)):
+            # A rejected request still means Stripe answered
+            self.breaker.record_success()
+        else:
+            self.counters['failures'] += 1
+            self.breaker.record_failure()
+
+    async def _attempt(self, fn, args, kwargs):
+        if self._slots.locked():
+            self._reject("Payment provider busy, please retry", 1)
+        if not self.breaker.allow():
+            self._reject("Payment provider unavailable, please retry", self.breaker.retry_after())
+        
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+        future.add_done_callback(self._settle)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            raise
+
+    async def call(self, fn, *args, retry: bool = False, **kwargs):
+        self.start()
+        self.counters['calls'] += 1
+        attempts = 1 + (self.retries if retry else 0)
+        for attempt in range(attempts):
+            try:
+                return await self._attempt(fn, args, kwargs)
+            except (asyncio.TimeoutError, *STRIPE_TRANSIENT_ERRORS) as e:
+                if attempt + 1 < attempts:
+                    self.counters['retries'] += 1
+                    await asyncio.sleep(random.uniform(0, self.retry_base * 2 ** attempt))
+                    continue
+                if isinstance(e, asyncio.TimeoutError):
+                    raise HTTPException(status_code=504, detail="Payment provider timed out")
+                raise HTTPException(status_code=502, detail=f"Payment provider error: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters,
+            'breaker': self.breaker.state,
+            'consecutive_failures': self.breaker.failures
+        }
+
+stripe_gateway = StripeGateway(
+    STRIPE_WORKERS, STRIPE_QUEUE_SIZE, STRIPE_TIMEOUT_SECONDS, STRIPE_RETRIES,
+    STRIPE_RETRY_BASE_SECONDS, CircuitBreaker(STRIPE_BREAKER_THRESHOLD, STRIPE_BREAKER_RESET_SECONDS)
+)
+
+# ==================== WEBHOOK INGESTION ====================
+
+def stripe_event_partition(event: dict) -> str:
+    """Ordering key: events for one org are applied one after another."""
+    obj = (event.get('data') or {}).get('object') or {}
+    metadata = obj.get('metadata') or {}
+    return metadata.get('org_id') or obj.get('id') or event['id']
+
+async def apply_checkout_session_completed(event: dict):
+    session = event['data']['object']
+    session_id = session.get('id')
+    payment_status = session.get('payment_status')
+    if not session_id:
+        return
+    
+    # Guarded by event time, so a late retry of an older event cannot undo a newer one
+    created = event.get('created', 0)
+    transaction = await db.payment_transactions.find_one_and_update(
+        {'session_id': session_id, '$or': [
+            {'last_event_created': {'$exists': False}},
+            {'last_event_created': {'$lte': created}}
+        ]},
+        {'$set': {
+            'payment_status': payment_status,
+            'status': 'completed' if payment_status == 'paid' else 'failed',
+            'last_event_created': created,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }},
+        projection={'_id': 0, 'org_id': 1}
+    )
+    if not transaction:
+        return
+    
+    # Update organization subscription if paid
+    if payment_status == 'paid':
+        await db.organizations.update_one(
+            {'id': transaction['org_id']},
+            {'$set': {'subscription_status': 'active'}}
+        )
+    notify_payment_update(session_id)
+
+# Event types we act on; everything else is stored and marked ignored
+STRIPE_EVENT_HANDLERS = {
+    'checkout.session.completed': apply_checkout_session_completed
+}
+
+class StripeEventProcessor:
+    """Applies persisted Stripe events with a pool of background workers.
+
+    Each ordering key (the org) always maps to the same worker, so one org's
+    events apply in the order this process received them. Events are claimed
+    in the database with a lease, so several server processes can share the
+    collection without applying an event concurrently, and a claim lost to a
+    crash becomes retryable once the lease runs out. Failed events back off
+    and retry up to ``max_attempts`` times, then stay ``failed`` for replay.
+    """
+
+    def __init__(self, workers: int, queue_size: int, max_attempts: int,
+                 lease_seconds: float, sweep_seconds: float):
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.max_attempts = max(1, max_attempts)
+        self.lease_seconds = lease_seconds
+        self.sweep_seconds = sweep_seconds
+        self.counters = {'received': 0, 'duplicates': 0, 'applied': 0, 'ignored': 0, 'retried': 0, 'failed': 0}
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._queued: set = set()
+
+    def start(self):
+        if self._tasks:
+            return
+        self._queues = [asyncio.Queue(self.queue_size) for _ in range(self.workers)]
+        self._tasks = [asyncio.create_task(self._work(queue)) for queue in self._queues]
+        self._tasks.append(asyncio.create_task(self._sweep()))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queues = []
+        self._queued.clear()
+
+    async def ingest(self, event: dict) -> bool:
+        """Persist a verified event. Returns False for a redelivery."""
+        now = datetime.now(timezone.utc)
+        doc = {
+            'event_id': event['id'],
+            'type': event['type'],
+            'partition': stripe_event_partition(event),
+            'created': event.get('created', 0),
+            'payload': event,
+            'status': 'pending',
+            'attempts': 0,
+            'received_at': now,
+            'next_attempt_at': now
+        }
+        try:
+            await db.stripe_events.insert_one(doc)
+        except DuplicateKeyError:
+            self.counters['duplicates'] += 1
+            return False
+        self.counters['received'] += 1
+        self.enqueue(doc['event_id'], doc['partition'])
+        return True
+
+    def enqueue(self, event_id: str, partition: str):
+        if not self._queues or event_id in self._queued:
+            return
+        queue = self._queues[zlib.crc32(partition.encode('utf-8')) % len(self._queues)]
+        try:
+            queue.put_nowait(event_id)
+            self._queued.add(event_id)
+        except asyncio.QueueFull:
+            pass  # it is stored as pending; the sweep brings it back
+
+    @staticmethod
+    def claimable(now: datetime) -> dict:
+        return {'$or': [
+            {'status': 'pending', 'next_attempt_at': {'$lte': now}},
+            {'status': 'processing', 'lease_until': {'$lte': now}}
+        ]}
+
+    async def process(self, event_id: str):
+        now = datetime.now(timezone.utc)
+        doc = await db.stripe_events.find_one_and_update(
+            {'event_id': event_id, **self.claimable(now)},
+            {
+                '$set': {'status': 'processing', 'lease_until': now + timedelta(seconds=self.lease_seconds)},
+                '$inc': {'attempts': 1}
+            },
+            projection={'_id': 0}
+        )
+        if doc is None:
+            return  # already applied, or another process holds it
+        doc['attempts'] += 1
+        
+        handler = STRIPE_EVENT_HANDLERS.get(doc['type'])
+        try:
+            if handler:
+                await handler(doc['payload'])
+        except Exception as e:
+            give_up = doc['attempts'] >= self.max_attempts
+            self.counters['failed' if give_up else 'retried'] += 1
+            logger.warning(f"Stripe event {event_id} failed (attempt {doc['attempts']}): {e}")
+            await db.stripe_events.update_one(
+                {'event_id': event_id},
+                {
+                    '$set': {
+                        'status': 'failed' if give_up else 'pending',
+                        'error': str(e),
+                        'next_attempt_at': now + timedelta(seconds=min(2 ** doc['attempts'], 300))
+                    },
+                    '$unset': {'lease_until': ''}
+                }
+            )
+            return
+        
+        outcome = 'applied' if handler else 'ignored'
+        self.counters[outcome] += 1
+        await db.stripe_events.update_one(
+            {'event_id': event_id},
+            {
+                '$set': {'status': outcome, 'applied_at': datetime.now(timezone.utc)},
+                '$unset': {'lease_until': '', 'error': ''}
+            }
+        )
+
+    async def _work(self, queue: asyncio.Queue):
+        while True:
+            event_id = await queue.get()
+            self._queued.discard(event_id)
+            try:
+                await self.process(event_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Left pending or processing; the sweep retries it
+                logger.warning(f"Stripe event {event_id} not processed: {e}")
+
+    async def _sweep(self):
+        """Requeue events that are due for retry, lost their claim, or never fit in a queue."""
+        while True:
+            try:
+                events = await db.stripe_events.find(
+                    self.claimable(datetime.now(timezone.utc)),
+                    {'_id': 0, 'event_id': 1, 'partition': 1}
+                ).sort([('created', 1), ('received_at', 1)]).to_list(self.queue_size)
+                for event in events:
+                    self.enqueue(event['event_id'], event['partition'])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Stripe event sweep failed: {e}")
+            await asyncio.sleep(self.sweep_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, 'queued': sum(queue.qsize() for queue in self._queues)}
+
+stripe_event_processor = StripeEventProcessor(
+    WEBHOOK_WORKERS, WEBHOOK_QUEUE_SIZE, WEBHOOK_MAX_ATTEMPTS, WEBHOOK_LEASE_SECONDS, WEBHOOK_SWEEP_SECONDS
+)
+
 # ==================== STRIPE PAYMENT ROUTES ====================
 
 SUBSCRIPTION_PACKAGES = {
@@ -523,7 +2222,7 @@ async def create_checkout_session(checkout: CheckoutRequest, request: Request, c
     
     # Create checkout session directly with Stripe
     try:
-        session = await asyncio.to_thread(
+        session = await stripe_gateway.call(
             stripe.checkout.Session.create,
             payment_method_types=['card'],
             line_items=[{
@@ -545,7 +2244,7 @@ async def create_checkout_session(checkout: CheckoutRequest, request: Request, c
                 'user_id': current_user['id']
             }
         )
-    except Exception as e:
+    except stripe.error.StripeError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
     # Create payment transaction record
@@ -566,8 +2265,40 @@ async def create_checkout_session(checkout: CheckoutRequest, request: Request, c
     
     return {'url': session.url, 'session_id': session.id}
 
-@api_router.get("/payments/status/{session_id}")
-async def get_payment_status(session_id: str, request: Request, current_user = Depends(get_current_user)):
+# session_id -> last status payload served for it
+payment_status_cache = TTLCache(PAYMENT_STATUS_CACHE_SIZE, PAYMENT_STATUS_CACHE_TTL_SECONDS)
+class PaymentWaiters:
+    """Per-session events the webhook sets to wake long-polls in this process."""
+
+    def __init__(self):
+        self._events: Dict[str, asyncio.Event] = {}
+        self._counts: Dict[str, int] = {}
+
+    async def wait(self, session_id: str, timeout: float):
+        event = self._events.setdefault(session_id, asyncio.Event())
+        self._counts[session_id] = self._counts.get(session_id, 0) + 1
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._counts[session_id] -= 1
+            if not self._counts[session_id]:
+                del self._counts[session_id]
+                self._events.pop(session_id, None)
+
+    def notify(self, session_id: str):
+        event = self._events.pop(session_id, None)
+        if event is not None:
+            event.set()
+
+payment_waiters = PaymentWaiters()
+
+def notify_payment_update(session_id: str):
+    payment_status_cache.pop(session_id)
+    payment_waiters.notify(session_id)
+
+async def refresh_payment_status(session_id: str) -> dict:
     # Check if transaction already processed
     transaction = await db.payment_transactions.find_one(
         {'session_id': session_id},
@@ -579,50 +2310,88 @@ async def get_payment_status(session_id: str, request: Request, current_user = D
     
     # If already processed as paid, return immediately
     if transaction['payment_status'] == 'paid':
-        return {
+        result = {
             'status': transaction['status'],
             'payment_status': transaction['payment_status'],
             'message': 'Payment already processed'
         }
+        payment_status_cache.set(session_id, result, ttl=PAYMENT_STATUS_PAID_TTL_SECONDS)
+        return result
     
     # Get status from Stripe
     try:
-        session = await asyncio.to_thread(
+        session = await stripe_gateway.call(
             stripe.checkout.Session.retrieve,
-            session_id
+            session_id,
+            retry=True
         )
-    except Exception as e:
+    except stripe.error.StripeError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
     # Map Stripe status to our internal status
     stripe_status = session.status
     payment_status = session.payment_status
     
-    # Update transaction
-    update_data = {
-        'status': stripe_status,
-        'payment_status': payment_status,
-        'updated_at': datetime.now(timezone.utc).isoformat()
-    }
-    
-    await db.payment_transactions.update_one(
-        {'session_id': session_id},
-        {'$set': update_data}
-    )
+    # Update transaction, unless this poll saw nothing new
+    if (stripe_status, payment_status) != (transaction.get('status'), transaction['payment_status']):
+        update_data = {
+            'status': stripe_status,
+            'payment_status': payment_status,
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }
+        
+        await db.payment_transactions.update_one(
+            {'session_id': session_id},
+            {'$set': update_data}
+        )
     
     # If payment successful and not yet processed, update organization
-    if payment_status == 'paid' and transaction['payment_status'] != 'paid':
+    if payment_status == 'paid':
         await db.organizations.update_one(
             {'id': transaction['org_id']},
             {'$set': {'subscription_status': 'active'}}
         )
     
-    return {
+    result = {
         'status': stripe_status,
         'payment_status': payment_status,
         'amount_total': session.amount_total / 100 if session.amount_total else 0,
         'currency': session.currency
     }
+    ttl = PAYMENT_STATUS_PAID_TTL_SECONDS if payment_status == 'paid' else None
+    payment_status_cache.set(session_id, result, ttl=ttl)
+    return result
+
+async def load_payment_status(session_id: str) -> dict:
+    """Cached status for a session; concurrent misses share one Stripe call."""
+    cached = payment_status_cache.get(session_id)
+    if cached is not None:
+        return cached
+    return await read_flights.do(('payment_status', session_id), lambda: refresh_payment_status(session_id))
+
+@api_router.get("/payments/status/{session_id}")
+async def get_payment_status(
+    session_id: str,
+    request: Request,
+    wait: float = Query(0, ge=0, le=PAYMENT_LONG_POLL_MAX_SECONDS),
+    current_user = Depends(get_current_user)
+):
+    """Payment status for a checkout session.
+
+    With ``wait`` > 0 this long-polls: an unpaid session is held for up to
+    ``wait`` seconds and answered as soon as the webhook marks it paid. The
+    status is also re-checked every PAYMENT_LONG_POLL_RECHECK_SECONDS, for
+    webhooks delivered to another worker.
+    """
+    result = await load_payment_status(session_id)
+    deadline = time.monotonic() + wait
+    while result['payment_status'] != 'paid':
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        await payment_waiters.wait(session_id, min(remaining, PAYMENT_LONG_POLL_RECHECK_SECONDS))
+        result = await load_payment_status(session_id)
+    return result
 
 @api_router.post("/payments/webhook")
 async def stripe_webhook(request: Request):
@@ -631,53 +2400,159 @@ async def stripe_webhook(request: Request):
     
     try:
         webhook_secret = os.environ.get('STRIPE_WEBHOOK_SECRET')
-        if not webhook_secret:
-             # If no secret, just proceed (insecure but allows functional testing if not configured)
-             # In production, this should be enforced.
-             event = stripe.Event.construct_from(
-                await request.json(), stripe.api_key
-             )
-        else:
-            event = stripe.Webhook.construct_event(
+        # If no secret, just proceed (insecure but allows functional testing if not configured)
+        # In production, this should be enforced.
+        if webhook_secret:
+            stripe.Webhook.construct_event(
                 body, signature, webhook_secret
             )
         
-        # Handle the event
-        if event['type'] == 'checkout.session.completed':
-            session = event['data']['object']
-            session_id = session.get('id')
-            payment_status = session.get('payment_status')
-            
-            # Update transaction based on webhook
-            if session_id:
-                transaction = await db.payment_transactions.find_one(
-                    {'session_id': session_id},
-                    {'_id': 0}
-                )
-                
-                if transaction:
-                    update_data = {
-                        'payment_status': payment_status,
-                        'status': 'completed' if payment_status == 'paid' else 'failed',
-                        'updated_at': datetime.now(timezone.utc).isoformat()
-                    }
-                    
-                    await db.payment_transactions.update_one(
-                        {'session_id': session_id},
-                        {'$set': update_data}
-                    )
-                    
-                    # Update organization subscription if paid
-                    if payment_status == 'paid':
-                        await db.organizations.update_one(
-                            {'id': transaction['org_id']},
-                            {'$set': {'subscription_status': 'active'}}
-                        )
-        
-        return {'status': 'success'}
+        payload = json.loads(body)
+        if not payload.get('id') or not payload.get('type'):
+            raise ValueError("Event id and type are required")
     except Exception as e:
         logger.error(f"Webhook error: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    
+    # Persist and acknowledge; stripe_event_processor applies it in the background.
+    # A storage failure falls through as a 500 so Stripe redelivers.
+    await stripe_event_processor.ingest(payload)
+    return {'status': 'success'}
+
+# ==================== ADMIN CONFIG ====================
+
+class ConfigStore:
+    """In-memory copy of admin_config that serves every read in this process.
+
+    Each write bumps a version counter; every process polls the counter and
+    reloads the (small) collection when it moves. Secret values are held
+    apart from the plain view: ``get`` and ``entries`` never return them
+    unless asked, so listing or logging settings cannot leak a secret.
+    """
+
+    COUNTER_ID = 'admin_config'
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self.version: Optional[int] = None
+        self.reloads = 0
+        self._entries: Dict[str, dict] = {}  # key_name -> document, secret values removed
+        self._secrets: Dict[str, str] = {}
+        self._poller: Optional[asyncio.Task] = None
+
+    def _apply(self, doc: dict):
+        doc = dict(doc)
+        key_name = doc['key_name']
+        self._secrets.pop(key_name, None)
+        if doc.get('is_secret'):
+            self._secrets[key_name] = doc.pop('value', None)
+        self._entries[key_name] = doc
+
+    async def _read_version(self) -> int:
+        counter = await db.counters.find_one({'_id': self.COUNTER_ID})
+        return counter['version'] if counter else 0
+
+    async def reload(self):
+        # Version first: a write landing in between only causes one extra reload
+        version = await self._read_version()
+        docs = await db.admin_config.find({}, {'_id': 0}).to_list(None)
+        self._entries = {}
+        self._secrets = {}
+        for doc in docs:
+            self._apply(doc)
+        self.version = version
+        self.reloads += 1
+
+    async def ensure_loaded(self):
+        if self.version is None:
+            await self.reload()
+
+    async def start(self):
+        try:
+            await self.reload()
+        except Exception as e:
+            logger.warning(f"Admin config not loaded, will retry: {e}")
+        if self._poller is None:
+            self._poller = asyncio.create_task(self._poll())
+
+    async def close(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+
+    async def _poll(self):
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            try:
+                if self.version is None or await self._read_version() != self.version:
+                    await self.reload()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Admin config refresh failed: {e}")
+
+    async def _bump_version(self):
+        # Only bumped: our own cached version must not advance past changes
+        # from other processes we have not loaded yet
+        await db.counters.update_one({'_id': self.COUNTER_ID}, {'$inc': {'version': 1}}, upsert=True)
+
+    def get(self, key_name: str, default: Optional[str] = None) -> Optional[str]:
+        """Value of a non-secret setting."""
+        entry = self._entries.get(key_name)
+        if entry is None or entry.get('is_secret'):
+            return default
+        return entry.get('value', default)
+
+    def get_secret(self, key_name: str, default: Optional[str] = None) -> Optional[str]:
+        return self._secrets.get(key_name, default)
+
+    def entries(self, include_secrets: bool = False) -> List[dict]:
+        result = []
+        for key_name, entry in self._entries.items():
+            entry = dict(entry)
+            if entry.get('is_secret'):
+                entry['value'] = self._secrets.get(key_name) if include_secrets else None
+            result.append(entry)
+        return result
+
+    async def set(self, key_name: str, value: str, is_secret: bool, updated_by: str):
+        now = datetime.now(timezone.utc).isoformat()
+        doc = await db.admin_config.find_one_and_update(
+            {'key_name': key_name},
+            {
+                '$set': {
+                    'value': value,
+                    'is_secret': is_secret,
+                    'updated_at': now,
+                    'updated_by': updated_by
+                },
+                '$setOnInsert': {'id': str(uuid.uuid4()), 'created_at': now}
+            },
+            projection={'_id': 0},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        await self._bump_version()
+        self._apply(doc)
+
+    async def delete(self, key_name: str) -> bool:
+        result = await db.admin_config.delete_one({'key_name': key_name})
+        if result.deleted_count == 0:
+            return False
+        await self._bump_version()
+        self._entries.pop(key_name, None)
+        self._secrets.pop(key_name, None)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'version': self.version,
+            'entries': len(self._entries),
+            'secrets': len(self._secrets),
+            'reloads': self.reloads
+        }
+
+config_store = ConfigStore(CONFIG_POLL_SECONDS)
 
 # ==================== ADMIN ROUTES ====================
 
@@ -685,42 +2560,63 @@ async def stripe_webhook(request: Request):
 async def get_admin_config(current_user = Depends(get_current_user)):
     await require_sys_admin(current_user)
     
-    configs = await db.admin_config.find({}, {'_id': 0}).to_list(100)
-    return configs
+    await config_store.ensure_loaded()
+    # The admin page reveals secrets on demand, so this view includes them
+    return config_store.entries(include_secrets=True)
 
 @api_router.post("/admin/config")
 async def update_admin_config(config: AdminConfigUpdate, current_user = Depends(get_current_user)):
     await require_sys_admin(current_user)
     
-    # Check if config exists
-    existing = await db.admin_config.find_one({'key_name': config.key_name})
+    await config_store.set(config.key_name, config.value, config.is_secret, current_user['id'])
     
-    config_doc = {
-        'key_name': config.key_name,
-        'value': config.value,
-        'is_secret': config.is_secret,
-        'updated_at': datetime.now(timezone.utc).isoformat(),
-        'updated_by': current_user['id']
+    return {"message": "Config updated successfully"}
+
+@api_router.get("/admin/cache-stats")
+async def get_cache_stats(current_user = Depends(get_current_user)):
+    await require_sys_admin(current_user)
+    
+    return {
+        'principals': principal_cache.stats(),
+        'roles': role_cache.stats(),
+        'names': name_resolver.stats(),
+        'coalescing': read_flights.stats(),
+        'config': config_store.stats()
     }
+
+@api_router.get("/admin/compression-stats")
+async def get_compression_stats(current_user = Depends(get_current_user)):
+    await require_sys_admin(current_user)
     
-    if existing:
-        await db.admin_config.update_one(
-            {'key_name': config.key_name},
-            {'$set': config_doc}
-        )
-    else:
-        config_doc['id'] = str(uuid.uuid4())
-        config_doc['created_at'] = datetime.now(timezone.utc).isoformat()
-        await db.admin_config.insert_one(config_doc)
+    return {
+        **compression_stats,
+        'bytes_saved': compression_stats['bytes_in'] - compression_stats['bytes_out'],
+        'brotli_available': brotli is not None
+    }
+
+@api_router.get("/admin/stripe-stats")
+async def get_stripe_stats(current_user = Depends(get_current_user)):
+    await require_sys_admin(current_user)
     
-    return {"message": "Config updated successfully"}
+    return stripe_gateway.stats()
+
+@api_router.get("/admin/webhook-stats")
+async def get_webhook_stats(current_user = Depends(get_current_user)):
+    await require_sys_admin(current_user)
+    
+    by_status = await db.stripe_events.aggregate([
+        {'$group': {'_id': '$status', 'count': {'$sum': 1}}}
+    ]).to_list(None)
+    return {
+        **stripe_event_processor.stats(),
+        'stored': {row['_id']: row['count'] for row in by_status}
+    }
 
 @api_router.delete("/admin/config/{key_name}")
 async def delete_admin_config(key_name: str, current_user = Depends(get_current_user)):
     await require_sys_admin(current_user)
     
-    result = await db.admin_config.delete_one({'key_name': key_name})
-    if result.deleted_count == 0:
+    if not await config_store.delete(key_name):
         raise HTTPException(status_code=404, detail="Config not found")
     
     return {"message": "Config deleted successfully"}
@@ -729,14 +2625,10 @@ async def delete_admin_config(key_name: str, current_user = Depends(get_current_
 async def make_sys_admin(user_id: str, current_user = Depends(get_current_user)):
     await require_sys_admin(current_user)
     
-    user = await db.users.find_one({'id': user_id})
+    user = await db.users.find_one({'id': user_id}, {'_id': 0, 'id': 1})
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    existing = await db.sys_admins.find_one({'user_id': user_id})
-    if existing:
-        raise HTTPException(status_code=400, detail="User is already a system admin")
-    
     admin_doc = {
         'id': str(uuid.uuid4()),
         'user_id': user_id,
@@ -744,36 +2636,171 @@ async def make_sys_admin(user_id: str, current_user = Depends(get_current_user))
         'created_by': current_user['id']
     }
     
-    await db.sys_admins.insert_one(admin_doc)
+    # The unique index on user_id rejects repeat grants
+    try:
+        await db.sys_admins.insert_one(admin_doc)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail="User is already a system admin")
+    finally:
+        principal_cache.invalidate_sys_admin(user_id)
     
     return {"message": "User promoted to system admin"}
 
 # ==================== DASHBOARD STATS ====================
 
+def org_stats_pipeline(org_id: str) -> List[dict]:
+    """Per-status and per-assignee task counts for an org in one aggregation.
+
+    Nothing here depends on the caller, so every member's dashboard can share
+    one run; each caller picks its own count out of ``by_assignee``.
+    """
+    return [
+        {'$match': {'org_id': org_id}},
+        {'$facet': {
+            'by_status': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}],
+            'by_assignee': [{'$group': {'_id': '$assigned_to', 'count': {'$sum': 1}}}]
+        }}
+    ]
+
+async def load_org_stats(org_id: str) -> dict:
+    facets, members_count = await asyncio.gather(
+        db.tasks.aggregate(org_stats_pipeline(org_id)).to_list(1),
+        db.organization_members.count_documents({'org_id': org_id})
+    )
+    
+    facet = facets[0] if facets else {}
+    return {
+        'total_tasks': sum(row['count'] for row in facet.get('by_status', [])),
+        'status_counts': {row['_id']: row['count'] for row in facet.get('by_status', []) if row['_id'] is not None},
+        'assignee_counts': {row['_id']: row['count'] for row in facet.get('by_assignee', []) if row['_id'] is not None},
+        'members_count': members_count
+    }
+
 @api_router.get("/organizations/{org_id}/stats")
-async def get_org_stats(org_id: str, current_user = Depends(get_current_user)):
+async def get_org_stats(org_id: str, request: Request, response: Response, current_user = Depends(get_current_user)):
     role = await get_user_org_role(current_user['id'], org_id)
     if not role:
         raise HTTPException(status_code=403, detail="Not a member of this organization")
     
-    total_tasks = await db.tasks.count_documents({'org_id': org_id})
-    pending_tasks = await db.tasks.count_documents({'org_id': org_id, 'status': 'pending'})
-    in_progress_tasks = await db.tasks.count_documents({'org_id': org_id, 'status': 'about_to_do'})
-    completed_tasks = await db.tasks.count_documents({'org_id': org_id, 'status': 'completed'})
+    not_modified = await check_not_modified(request, response, org_id, current_user['id'], 'private, no-cache')
+    if not_modified:
+        return not_modified
     
-    my_tasks = await db.tasks.count_documents({'org_id': org_id, 'assigned_to': current_user['id']})
-    
-    members_count = await db.organization_members.count_documents({'org_id': org_id})
+    key = ('org_stats', org_id, await get_cached_org_version(org_id), role)
+    stats = await read_flights.do(key, lambda: load_org_stats(org_id))
+    status_counts = stats['status_counts']
     
     return {
-        'total_tasks': total_tasks,
-        'pending_tasks': pending_tasks,
-        'in_progress_tasks': in_progress_tasks,
-        'completed_tasks': completed_tasks,
-        'my_tasks': my_tasks,
-        'members_count': members_count
+        'total_tasks': stats['total_tasks'],
+        'pending_tasks': status_counts.get('pending', 0),
+        'in_progress_tasks': status_counts.get('about_to_do', 0),
+        'completed_tasks': status_counts.get('completed', 0),
+        'my_tasks': stats['assignee_counts'].get(current_user['id'], 0),
+        'members_count': stats['members_count'],
+        'status_counts': status_counts
     }
 
+# ==================== INDEXES ====================
+
+# Every index the queries above rely on: (collection, keys, options)
+REQUIRED_INDEXES = [
+    ('users', [('email', 1)], {'unique': True}),
+    ('users', [('id', 1)], {'unique': True}),
+    ('organizations', [('id', 1)], {'unique': True}),
+    ('organization_members', [('user_id', 1), ('org_id', 1)], {'unique': True}),
+    ('organization_members', [('org_id', 1)], {}),
+    ('tasks', [('id', 1)], {'unique': True}),
+    ('tasks', [('org_id', 1), ('status', 1)], {}),
+    ('tasks', [('org_id', 1), ('assigned_to', 1)], {}),
+    ('tasks', [('org_id', 1), ('created_at', 1), ('id', 1)], {}),
+    ('tasks', [('org_id', 1), ('version', 1)], {}),
+    ('task_tombstones', [('org_id', 1), ('version', 1)], {}),
+    ('task_tombstones', [('deleted_at', 1)], {'expireAfterSeconds': TOMBSTONE_TTL_DAYS * 86400}),
+    ('payment_transactions', [('session_id', 1)], {'unique': True}),
+    ('stripe_events', [('event_id', 1)], {'unique': True}),
+    ('stripe_events', [('status', 1), ('next_attempt_at', 1)], {}),
+    ('stripe_events', [('status', 1), ('lease_until', 1)], {}),
+    ('stripe_events', [('applied_at', 1)], {'expireAfterSeconds': WEBHOOK_EVENT_RETENTION_DAYS * 86400}),
+    ('sys_admins', [('user_id', 1)], {'unique': True}),
+    ('admin_config', [('key_name', 1)], {'unique': True}),
+]
+
+# Representative query shapes whose plans are checked for collection scans
+INDEX_PROBES = [
+    ('users', {'email': ''}),
+    ('users', {'id': ''}),
+    ('organizations', {'id': ''}),
+    ('organization_members', {'user_id': '', 'org_id': ''}),
+    ('organization_members', {'user_id': ''}),
+    ('organization_members', {'org_id': ''}),
+    ('tasks', {'id': '', 'org_id': ''}),
+    ('tasks', {'org_id': ''}),
+    ('tasks', {'org_id': '', 'status': ''}),
+    ('tasks', {'org_id': '', 'assigned_to': ''}),
+    ('tasks', {'org_id': '', 'version': 0}),
+    ('task_tombstones', {'org_id': '', 'version': 0}),
+    ('payment_transactions', {'session_id': ''}),
+    ('stripe_events', {'event_id': ''}),
+    ('stripe_events', {'status': '', 'next_attempt_at': datetime.now(timezone.utc)}),
+    ('sys_admins', {'user_id': ''}),
+    ('admin_config', {'key_name': ''}),
+]
+
+def format_index_plan() -> str:
+    lines = ["Required indexes:"]
+    for collection, keys, options in REQUIRED_INDEXES:
+        spec = ', '.join(f"{field}: {direction}" for field, direction in keys)
+        flags = ' (unique)' if options.get('unique') else ''
+        if 'expireAfterSeconds' in options:
+            flags += f" (ttl {options['expireAfterSeconds']}s)"
+        lines.append(f"  {collection} {{{spec}}}{flags}")
+    lines.append("Checked query shapes:")
+    for collection, query in INDEX_PROBES:
+        lines.append(f"  {collection} {sorted(query)}")
+    return '\n'.join(lines)
+
+async def ensure_indexes() -> List[str]:
+    """Create every required index; already-existing indexes are a no-op."""
+    errors = []
+    for collection, keys, options in REQUIRED_INDEXES:
+        try:
+            await db[collection].create_index(keys, **options)
+        except Exception as e:
+            errors.append(f"{collection} {keys}: {e}")
+    return errors
+
+def _plan_stages(plan: dict):
+    yield plan.get('stage')
+    if 'inputStage' in plan:
+        yield from _plan_stages(plan['inputStage'])
+    for child in plan.get('inputStages', []):
+        yield from _plan_stages(child)
+
+async def find_unindexed_queries() -> List[str]:
+    """Explain each probe query and report the ones planned as a collection scan."""
+    unindexed = []
+    for collection, query in INDEX_PROBES:
+        explained = await db[collection].find(query).explain()
+        winning_plan = explained.get('queryPlanner', {}).get('winningPlan', {})
+        if 'COLLSCAN' in set(_plan_stages(winning_plan)):
+            unindexed.append(f"{collection} {sorted(query)}")
+    return unindexed
+
+async def bootstrap_indexes():
+    if INDEX_CHECK_MODE == 'off':
+        return
+    
+    problems = await ensure_indexes()
+    try:
+        problems += [f"collection scan: {q}" for q in await find_unindexed_queries()]
+    except Exception as e:
+        problems.append(f"could not verify query plans: {e}")
+    
+    for problem in problems:
+        logger.warning(f"Index check: {problem}")
+    if problems and INDEX_CHECK_MODE == 'strict':
+        raise RuntimeError(f"Index check failed with {len(problems)} problem(s)")
+
 # Include router
 app.include_router(api_router)
 
@@ -795,14 +2822,57 @@ app.add_middleware(
     allow_origins=origins,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESSION_MIN_BYTES)
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
 
+@app.on_event("startup")
+async def start_password_hasher():
+    password_hasher.start()
+
+@app.on_event("startup")
+async def start_stripe_event_processor():
+    stripe_event_processor.start()
+
+@app.on_event("startup")
+async def load_admin_config():
+    await config_store.start()
+
+@app.on_event("startup")
+async def create_indexes():
+    await bootstrap_indexes()
+
+@app.on_event("startup")
+async def stamp_unversioned_tasks():
+    stamped = await backfill_task_versions()
+    if stamped:
+        logger.info(f"Stamped a version on {stamped} task(s) written before versioning")
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    await task_event_hub.close()
+    await stripe_event_processor.close()
+    await config_store.close()
+    client.close()
+    password_hasher.shutdown()
+    compression_executor.shutdown(wait=False)
+    stripe_gateway.shutdown()
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='TaskFlow API server utilities.')
+    parser.add_argument('--print-index-plan', action='store_true', help='Print the required indexes and exit')
+    args = parser.parse_args()
+    
+    if args.print_index_plan:
+        print(format_index_plan())
+    else:
+        parser.print_help()
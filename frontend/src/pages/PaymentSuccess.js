@@ -23,7 +23,8 @@ const PaymentSuccess = () => {
     const maxAttempts = 5;
     
     try {
-      const response = await paymentAPI.getStatus(sessionId);
+      // Long-poll: the server answers as soon as the payment is confirmed
+      const response = await paymentAPI.getStatus(sessionId, 20);
       
       if (response.data.payment_status === 'paid') {
         setStatus('success');
@@ -33,7 +34,7 @@ const PaymentSuccess = () => {
       
       if (attempts < maxAttempts) {
         setAttempts(prev => prev + 1);
-        setTimeout(pollPaymentStatus, 2000);
+        pollPaymentStatus();
       } else {
         setStatus('timeout');
         toast.error('Payment verification timed out. Please contact support.');
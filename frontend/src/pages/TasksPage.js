@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Button } from '@/components/ui/button';
 import { Input } from '@/components/ui/input';
@@ -18,7 +18,10 @@ const TasksPage = ({ user }) => {
   const navigate = useNavigate();
   const [tasks, setTasks] = useState([]);
   const [members, setMembers] = useState([]);
+  const membersRef = useRef([]);
   const [loading, setLoading] = useState(true);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [createDialogOpen, setCreateDialogOpen] = useState(false);
   const [editingTask, setEditingTask] = useState(null);
   const [activeFilter, setActiveFilter] = useState('all');
@@ -27,18 +30,52 @@ const TasksPage = ({ user }) => {
     fetchData();
   }, [orgId, activeFilter]);
 
+  useEffect(() => {
+    membersRef.current = members;
+  }, [members]);
+
+  useEffect(() => {
+    const matchesFilter = (task) => {
+      if (activeFilter === 'my-tasks') return task.assigned_to === user?.id;
+      if (activeFilter === 'daily') return task.is_daily;
+      if (['pending', 'about_to_do', 'completed'].includes(activeFilter)) return task.status === activeFilter;
+      return true;
+    };
+
+    return taskAPI.subscribe(orgId, (type, payload) => {
+      if (type === 'reset') {
+        fetchData();
+      } else if (type === 'delete') {
+        setTasks((current) => current.filter((t) => t.id !== payload.task_id));
+      } else if (type === 'upsert') {
+        const assignee = membersRef.current.find((m) => m.user_id === payload.task.assigned_to);
+        const task = { ...payload.task, assigned_to_name: assignee ? assignee.full_name : null };
+        setTasks((current) => {
+          const others = current.filter((t) => t.id !== task.id);
+          if (!matchesFilter(task)) return others;
+          if (others.length === current.length) return [...current, task];
+          return current.map((t) => (t.id === task.id ? task : t));
+        });
+      }
+    });
+  }, [orgId, activeFilter]);
+
+  const getFilterParams = () => {
+    const params = {};
+    if (activeFilter === 'my-tasks') params.assigned_to_me = true;
+    if (activeFilter === 'daily') params.is_daily = true;
+    if (['pending', 'about_to_do', 'completed'].includes(activeFilter)) params.status = activeFilter;
+    return params;
+  };
+
   const fetchData = async () => {
     try {
-      const params = {};
-      if (activeFilter === 'my-tasks') params.assigned_to_me = true;
-      if (activeFilter === 'daily') params.is_daily = true;
-      if (['pending', 'about_to_do', 'completed'].includes(activeFilter)) params.status = activeFilter;
-
       const [tasksRes, membersRes] = await Promise.all([
-        taskAPI.getAll(orgId, params),
+        taskAPI.getAll(orgId, getFilterParams()),
         organizationAPI.getMembers(orgId),
       ]);
       setTasks(tasksRes.data);
+      setNextCursor(tasksRes.headers['x-next-cursor'] || null);
       setMembers(membersRes.data);
     } catch (error) {
       toast.error('Failed to load tasks');
@@ -47,6 +84,20 @@ const TasksPage = ({ user }) => {
     }
   };
 
+  const loadMoreTasks = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const tasksRes = await taskAPI.getAll(orgId, { ...getFilterParams(), cursor: nextCursor });
+      setTasks((current) => [...current, ...tasksRes.data]);
+      setNextCursor(tasksRes.headers['x-next-cursor'] || null);
+    } catch (error) {
+      toast.error('Failed to load more tasks');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleCreateTask = async (e) => {
     e.preventDefault();
     const formData = new FormData(e.target);
@@ -219,7 +270,7 @@ const TasksPage = ({ user }) => {
               </Button>
               <div>
                 <h1 className="text-2xl font-bold">Tasks</h1>
-                <p className="text-sm text-muted-foreground mt-1">{tasks.length} tasks</p>
+                <p className="text-sm text-muted-foreground mt-1">{tasks.length}{nextCursor ? '+' : ''} tasks</p>
               </div>
             </div>
             <Dialog open={createDialogOpen} onOpenChange={setCreateDialogOpen}>
@@ -346,6 +397,16 @@ const TasksPage = ({ user }) => {
                 </CardHeader>
               </Card>
             ))}
+            {nextCursor && (
+              <Button
+                variant="outline"
+                onClick={loadMoreTasks}
+                disabled={loadingMore}
+                data-testid="load-more-tasks-button"
+              >
+                {loadingMore ? 'Loading...' : 'Load More'}
+              </Button>
+            )}
           </div>
         )}
       </div>
@@ -29,11 +29,63 @@ export const taskAPI = {
   getOne: (orgId, taskId) => axios.get(`${API_BASE}/organizations/${orgId}/tasks/${taskId}`, { headers: getAuthHeaders() }),
   update: (orgId, taskId, data) => axios.patch(`${API_BASE}/organizations/${orgId}/tasks/${taskId}`, data, { headers: getAuthHeaders() }),
   delete: (orgId, taskId) => axios.delete(`${API_BASE}/organizations/${orgId}/tasks/${taskId}`, { headers: getAuthHeaders() }),
+  // Live task feed over server-sent events; returns an unsubscribe function.
+  // fetch is used instead of EventSource so the bearer token can be sent.
+  subscribe: (orgId, onEvent) => {
+    const controller = new AbortController();
+    let lastEventId = null;
+
+    const handleBlock = (block) => {
+      const event = { type: 'message', data: '' };
+      block.split('\n').forEach((line) => {
+        if (line.startsWith('id: ')) event.id = line.slice(4);
+        else if (line.startsWith('event: ')) event.type = line.slice(7);
+        else if (line.startsWith('data: ')) event.data += line.slice(6);
+      });
+      if (!event.data) return;
+      lastEventId = event.type === 'reset' ? null : event.id || lastEventId;
+      onEvent(event.type, JSON.parse(event.data));
+    };
+
+    const connect = async () => {
+      while (!controller.signal.aborted) {
+        try {
+          const headers = { ...getAuthHeaders(), Accept: 'text/event-stream' };
+          if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+          const response = await fetch(`${API_BASE}/organizations/${orgId}/tasks/stream`, {
+            headers,
+            signal: controller.signal,
+          });
+          if (!response.ok) throw new Error(`Task stream failed: ${response.status}`);
+
+          const reader = response.body.pipeThrough(new TextDecoderStream()).getReader();
+          let buffer = '';
+          for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += value;
+            let boundary = buffer.indexOf('\n\n');
+            while (boundary !== -1) {
+              handleBlock(buffer.slice(0, boundary));
+              buffer = buffer.slice(boundary + 2);
+              boundary = buffer.indexOf('\n\n');
+            }
+          }
+        } catch (error) {
+          if (controller.signal.aborted) return;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 3000));
+      }
+    };
+
+    connect();
+    return () => controller.abort();
+  },
 };
 
 export const paymentAPI = {
   createCheckout: (data) => axios.post(`${API_BASE}/payments/checkout`, data, { headers: getAuthHeaders() }),
-  getStatus: (sessionId) => axios.get(`${API_BASE}/payments/status/${sessionId}`, { headers: getAuthHeaders() }),
+  getStatus: (sessionId, wait = 0) => axios.get(`${API_BASE}/payments/status/${sessionId}`, { params: { wait }, headers: getAuthHeaders() }),
 };
 
 export const adminAPI = {
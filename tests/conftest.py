@@ -0,0 +1,175 @@
+import os
+import sys
+import asyncio
+import inspect
+import functools
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+os.environ.setdefault('MONGO_URL', 'mongodb://localhost:27017')
+os.environ.setdefault('DB_NAME', 'taskflow_test')
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'backend'))
+
+
+class DbSpy:
+    """Wraps the database to count round trips and hold chosen calls.
+
+    Calls that overlap in time count as one round trip, so work issued
+    together through asyncio.gather is one trip and awaited-in-turn work is
+    several. ``hold`` parks the next call to a collection method until the
+    returned event is set, to force an interleaving between requests.
+    """
+
+    def __init__(self, db):
+        self._db = db
+        self._holds = {}
+        self._in_flight = 0
+        self.calls = []
+        self.round_trips = 0
+
+    def __getattr__(self, name):
+        return CollectionSpy(self, name, getattr(self._db, name))
+
+    def __getitem__(self, name):
+        return self.__getattr__(name)
+
+    def hold(self, collection: str, method: str) -> asyncio.Event:
+        release = asyncio.Event()
+        self._holds[(collection, method)] = release
+        return release
+
+    def reset(self):
+        self.calls.clear()
+        self.round_trips = 0
+
+    async def call(self, collection: str, method: str, fn, *args, **kwargs):
+        if self._in_flight == 0:
+            self.round_trips += 1
+        self._in_flight += 1
+        self.calls.append(f'{collection}.{method}')
+        try:
+            # Let calls issued alongside this one start before it completes
+            await asyncio.sleep(0)
+            release = self._holds.pop((collection, method), None)
+            if release is not None:
+                await release.wait()
+            return await fn(*args, **kwargs)
+        finally:
+            self._in_flight -= 1
+
+
+class CollectionSpy:
+    def __init__(self, spy: DbSpy, name: str, collection):
+        self._spy = spy
+        self._name = name
+        self._collection = collection
+
+    def __getattr__(self, method):
+        value = getattr(self._collection, method)
+        if method == 'find_one_and_update':
+            value = functools.partial(find_one_and_update, value)
+        if method in ('find', 'aggregate'):
+            return lambda *args, **kwargs: CursorSpy(self._spy, f'{self._name}.{method}', value(*args, **kwargs))
+        if inspect.iscoroutinefunction(value):
+            return lambda *args, **kwargs: self._spy.call(self._name, method, value, *args, **kwargs)
+        return value
+
+
+async def find_one_and_update(method, filter, update, projection=None, **kwargs):
+    # mongomock re-applies the filter to the updated document when given a
+    # projection, so a write that changes a filtered field returns None
+    doc = await method(filter, update, **kwargs)
+    if doc is None or not projection:
+        return doc
+    if any(projection.values()):
+        return {k: v for k, v in doc.items() if projection.get(k, k != '_id')}
+    return {k: v for k, v in doc.items() if k not in projection}
+
+
+class CursorSpy:
+    def __init__(self, spy: DbSpy, name: str, cursor):
+        self._spy = spy
+        self._name = name
+        self._cursor = cursor
+
+    def __getattr__(self, attr):
+        value = getattr(self._cursor, attr)
+        if attr == 'to_list':
+            return lambda *args, **kwargs: self._spy.call(self._name, 'to_list', value, *args, **kwargs)
+        if not callable(value):
+            return value
+
+        def chain(*args, **kwargs):
+            result = value(*args, **kwargs)
+            return CursorSpy(self._spy, self._name, result) if result is self._cursor else result
+        return chain
+
+    def __aiter__(self):
+        return self._cursor.__aiter__()
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def db(monkeypatch):
+    mongomock_motor = pytest.importorskip('mongomock_motor')
+    import server
+
+    spy = DbSpy(mongomock_motor.AsyncMongoMockClient()['taskflow_test'])
+    monkeypatch.setattr(server, 'db', spy)
+    for cache in (server.role_cache, server.org_version_cache, server.name_resolver.names, server.payment_status_cache):
+        cache.clear()
+    server.principal_cache.clear()
+    return spy
+
+
+@pytest.fixture
+async def client(db):
+    httpx = pytest.importorskip('httpx')
+    import server
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://testserver') as client:
+        yield client
+
+
+@pytest.fixture
+def make_user(db):
+    import server
+
+    async def make_user(full_name: str, **fields) -> dict:
+        user_id = str(uuid.uuid4())
+        await db.users.insert_one({
+            'id': user_id,
+            'email': f"{full_name.lower().replace(' ', '.')}@example.com",
+            'full_name': full_name,
+            'password_hash': 'unused',
+            'created_at': datetime.now(timezone.utc).isoformat()
+        })
+        token = server.create_access_token(user_id)
+        return {'id': user_id, 'headers': {'Authorization': f'Bearer {token}'}, **fields}
+    return make_user
+
+
+@pytest.fixture
+def make_org(client, db):
+    async def make_org(owner: dict, *members: dict) -> str:
+        response = await client.post('/api/organizations', json={'name': 'Acme'}, headers=owner['headers'])
+        assert response.status_code == 200, response.text
+        org_id = response.json()['id']
+        for member in members:
+            await db.organization_members.insert_one({
+                'id': str(uuid.uuid4()),
+                'org_id': org_id,
+                'user_id': member['id'],
+                'role': member.get('role', 'employee'),
+                'created_at': datetime.now(timezone.utc).isoformat()
+            })
+        return org_id
+    return make_org
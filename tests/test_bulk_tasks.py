@@ -0,0 +1,26 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_filtered_bulk_delete_works_in_bounded_batches(client, db, make_user, make_org, monkeypatch):
+    monkeypatch.setattr(server, 'BULK_MAX_ITEMS', 3)
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+    tasks_url = f'/api/organizations/{org_id}/tasks/bulk'
+    items = [{'title': f'Done {n}', 'status': 'completed'} for n in range(7)] + [{'title': 'Open', 'status': 'pending'}]
+    for start in range(0, len(items), 3):
+        response = await client.post(tasks_url, json=items[start:start + 3], headers=owner['headers'])
+        assert response.status_code == 200, response.text
+    db.reset()
+
+    response = await client.request('DELETE', tasks_url, json={'status': 'completed'}, headers=owner['headers'])
+    assert response.status_code == 200
+    assert response.json() == {'deleted_count': 7}
+    assert db.calls.count('tasks.delete_many') == 3
+
+    remaining = await db.tasks.find({'org_id': org_id}, {'_id': 0, 'title': 1}).to_list(None)
+    assert remaining == [{'title': 'Open'}]
+    assert await db.task_tombstones.count_documents({'org_id': org_id}) == 7
@@ -0,0 +1,37 @@
+import pytest
+from starlette.requests import Request
+
+import server
+
+pytestmark = pytest.mark.skipif(server.msgpack is None, reason='msgpack is not installed')
+
+
+def request_accepting(accept: str) -> Request:
+    return Request({'type': 'http', 'headers': [(b'accept', accept.encode('latin-1'))]})
+
+
+@pytest.mark.parametrize('accept', [
+    'application/msgpack',
+    'application/x-msgpack',
+    'application/json;q=0.5, application/msgpack',
+    'application/msgpack, */*;q=0.1',
+    'application/msgpack;q=0.9, application/*;q=0.5',
+])
+def test_msgpack_when_weighted_above_json(accept):
+    assert server.wants_msgpack(request_accepting(accept))
+
+
+@pytest.mark.parametrize('accept', [
+    '',
+    '*/*',
+    'application/json',
+    'application/json, application/msgpack;q=0.1',
+    'application/msgpack, application/json',
+    'application/msgpack;q=0',
+    'application/msgpack;q=0.00',
+    'application/msgpack; q=0.000, */*',
+    'application/msgpack;q=0.5, */*',
+    'application/msgpack;q=bogus',
+])
+def test_json_otherwise(accept):
+    assert not server.wants_msgpack(request_accepting(accept))
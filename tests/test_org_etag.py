@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+LIST_FIELDS = 'fields=id,title,version'
+
+
+async def org_counter(db, org_id: str) -> int:
+    counter = await db.org_counters.find_one({'_id': org_id})
+    return counter['version'] if counter else 0
+
+
+async def test_etag_seen_during_a_write_does_not_match_after_it_lands(client, db, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+    tasks_url = f'/api/organizations/{org_id}/tasks?{LIST_FIELDS}'
+
+    release = db.hold('tasks', 'insert_one')
+    create = asyncio.ensure_future(client.post(
+        f'/api/organizations/{org_id}/tasks', json={'title': 'Landed late'}, headers=owner['headers']
+    ))
+    while 'tasks.insert_one' not in db.calls:
+        await asyncio.sleep(0)
+
+    response = await client.get(tasks_url, headers=owner['headers'])
+    assert response.json() == []
+    etag = response.headers['ETag']
+
+    release.set()
+    created = (await create).json()
+
+    response = await client.get(tasks_url, headers={**owner['headers'], 'If-None-Match': etag})
+    assert response.status_code == 200
+    assert [task['id'] for task in response.json()] == [created['id']]
+
+
+async def test_failed_patches_leave_the_org_version_alone(client, db, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    employee = await make_user('Eve Employee')
+    org_id = await make_org(owner, employee)
+    response = await client.post(f'/api/organizations/{org_id}/tasks', json={'title': 'Owner only'}, headers=owner['headers'])
+    task_url = f"/api/organizations/{org_id}/tasks/{response.json()['id']}"
+    version = await org_counter(db, org_id)
+
+    response = await client.patch(f'/api/organizations/{org_id}/tasks/missing', json={'status': 'completed'}, headers=owner['headers'])
+    assert response.status_code == 404
+    response = await client.patch(task_url, json={'status': 'completed'}, headers=employee['headers'])
+    assert response.status_code == 403
+    response = await client.patch(task_url, json={'status': 'completed'}, headers={**owner['headers'], 'If-Match': '"1"'})
+    assert response.status_code == 412
+    assert await org_counter(db, org_id) == version
+
+    response = await client.patch(task_url, json={'status': 'completed'}, headers=owner['headers'])
+    assert response.status_code == 200
+    assert await org_counter(db, org_id) == version + 1
+
+
+async def test_members_and_stats_revalidate_every_time(client, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+
+    for path in ('members', 'stats'):
+        response = await client.get(f'/api/organizations/{org_id}/{path}', headers=owner['headers'])
+        assert response.status_code == 200
+        assert response.headers['Cache-Control'] == 'private, no-cache'
@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+def checkout_completed(event_id: str, created: int, payment_status: str) -> dict:
+    return {
+        'id': event_id,
+        'object': 'event',
+        'type': 'checkout.session.completed',
+        'created': created,
+        'data': {'object': {
+            'id': 'cs_test_1',
+            'object': 'checkout.session',
+            'payment_status': payment_status,
+            'metadata': {'org_id': 'org-1'}
+        }}
+    }
+
+
+@pytest.fixture
+async def processor(db, monkeypatch):
+    await db.stripe_events.create_index('event_id', unique=True)
+    await db.payment_transactions.insert_one({
+        'session_id': 'cs_test_1', 'org_id': 'org-1', 'status': 'pending', 'payment_status': 'unpaid'
+    })
+    # Not started: tests drive process() themselves instead of the workers
+    processor = server.StripeEventProcessor(1, 10, max_attempts=2, lease_seconds=60, sweep_seconds=15)
+    monkeypatch.setattr(server, 'stripe_event_processor', processor)
+    return processor
+
+
+@pytest.fixture
+def applied(monkeypatch):
+    calls = []
+    handler = server.STRIPE_EVENT_HANDLERS['checkout.session.completed']
+
+    async def counting_handler(event):
+        calls.append(event['id'])
+        await handler(event)
+
+    monkeypatch.setitem(server.STRIPE_EVENT_HANDLERS, 'checkout.session.completed', counting_handler)
+    return calls
+
+
+async def test_redelivered_event_is_acked_without_a_second_apply(client, db, processor, applied, monkeypatch):
+    monkeypatch.delenv('STRIPE_WEBHOOK_SECRET', raising=False)
+    event = checkout_completed('evt_1', 100, 'paid')
+
+    for _ in range(2):
+        response = await client.post('/api/payments/webhook', json=event)
+        assert response.status_code == 200
+        await processor.process('evt_1')
+
+    assert applied == ['evt_1']
+    assert processor.counters['duplicates'] == 1
+    assert await db.stripe_events.count_documents({}) == 1
+    stored = await db.stripe_events.find_one({'event_id': 'evt_1'})
+    assert stored['status'] == 'applied'
+
+
+async def test_older_event_cannot_overwrite_a_newer_one(db, processor):
+    await processor.ingest(checkout_completed('evt_new', 200, 'paid'))
+    await processor.process('evt_new')
+    await processor.ingest(checkout_completed('evt_old', 100, 'unpaid'))
+    await processor.process('evt_old')
+
+    transaction = await db.payment_transactions.find_one({'session_id': 'cs_test_1'})
+    assert transaction['payment_status'] == 'paid'
+    assert transaction['status'] == 'completed'
+    assert transaction['last_event_created'] == 200
+
+
+async def test_failing_event_backs_off_then_ends_failed(db, processor, monkeypatch):
+    async def broken_handler(event):
+        raise RuntimeError('database unavailable')
+
+    monkeypatch.setitem(server.STRIPE_EVENT_HANDLERS, 'checkout.session.completed', broken_handler)
+    await processor.ingest(checkout_completed('evt_1', 100, 'paid'))
+
+    await processor.process('evt_1')
+    stored = await db.stripe_events.find_one({'event_id': 'evt_1'})
+    assert (stored['status'], stored['attempts'], stored['error']) == ('pending', 1, 'database unavailable')
+    assert processor.counters['retried'] == 1
+
+    # Not due yet, so a second delivery to the worker leaves it alone
+    await processor.process('evt_1')
+    assert (await db.stripe_events.find_one({'event_id': 'evt_1'}))['attempts'] == 1
+
+    await db.stripe_events.update_one(
+        {'event_id': 'evt_1'}, {'$set': {'next_attempt_at': datetime.now(timezone.utc) - timedelta(seconds=1)}}
+    )
+    await processor.process('evt_1')
+    stored = await db.stripe_events.find_one({'event_id': 'evt_1'})
+    assert (stored['status'], stored['attempts']) == ('failed', 2)
+    assert processor.counters['failed'] == 1
@@ -0,0 +1,170 @@
+import time
+import asyncio
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+import stripe
+from fastapi import HTTPException
+
+import fake_stripe
+from server import CircuitBreaker, StripeGateway
+
+pytestmark = pytest.mark.anyio
+
+
+class FlakyCall:
+    """Stub Stripe call: raises the queued errors in turn, then returns ``result``."""
+
+    def __init__(self, *errors, result='ok', block: threading.Event = None):
+        self.errors = list(errors)
+        self.result = result
+        self.block = block
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        if self.block is not None:
+            self.block.wait(5)
+        if self.errors:
+            raise self.errors.pop(0)
+        return self.result
+
+
+def connection_error():
+    return stripe.error.APIConnectionError('connection reset')
+
+
+@pytest.fixture
+def make_gateway():
+    gateways = []
+
+    def make_gateway(workers=2, queue_size=2, timeout=1.0, retries=2, threshold=5, reset_seconds=30.0):
+        gateway = StripeGateway(workers, queue_size, timeout, retries, 0.001, CircuitBreaker(threshold, reset_seconds))
+        gateways.append(gateway)
+        return gateway
+
+    yield make_gateway
+    for gateway in gateways:
+        gateway.shutdown()
+
+
+async def test_slow_call_times_out_with_504(make_gateway):
+    gateway = make_gateway(timeout=0.05, retries=0)
+    release = threading.Event()
+    try:
+        with pytest.raises(HTTPException) as raised:
+            await gateway.call(FlakyCall(block=release))
+    finally:
+        release.set()
+    assert raised.value.status_code == 504
+    assert gateway.counters['timeouts'] == 1
+
+
+async def test_retryable_read_is_retried_until_it_succeeds(make_gateway):
+    gateway = make_gateway(retries=2)
+    retrieve = FlakyCall(connection_error(), connection_error(), result={'id': 'cs_1'})
+
+    assert await gateway.call(retrieve, 'cs_1', retry=True) == {'id': 'cs_1'}
+    assert retrieve.calls == 3
+    assert gateway.counters['retries'] == 2
+
+
+async def test_create_is_not_retried(make_gateway):
+    gateway = make_gateway(retries=2)
+    create = FlakyCall(connection_error())
+
+    with pytest.raises(HTTPException) as raised:
+        await gateway.call(create, mode='payment')
+    assert raised.value.status_code == 502
+    assert create.calls == 1
+
+
+async def test_breaker_opens_and_fails_fast(make_gateway):
+    gateway = make_gateway(retries=0, threshold=2)
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            await gateway.call(FlakyCall(connection_error()))
+    assert gateway.breaker.state == 'open'
+
+    untouched = FlakyCall()
+    with pytest.raises(HTTPException) as raised:
+        await gateway.call(untouched)
+    assert raised.value.status_code == 503
+    assert int(raised.value.headers['Retry-After']) >= 1
+    assert untouched.calls == 0
+
+
+async def test_half_open_trial_closes_or_reopens_the_breaker(make_gateway):
+    gateway = make_gateway(retries=0, threshold=1, reset_seconds=0.05)
+    with pytest.raises(HTTPException):
+        await gateway.call(FlakyCall(connection_error()))
+    time.sleep(0.06)
+    assert gateway.breaker.state == 'half_open'
+
+    # A failed trial opens it again straight away
+    with pytest.raises(HTTPException):
+        await gateway.call(FlakyCall(connection_error()))
+    assert gateway.breaker.state == 'open'
+
+    time.sleep(0.06)
+    assert await gateway.call(FlakyCall()) == 'ok'
+    assert gateway.breaker.state == 'closed'
+
+
+async def test_declined_request_does_not_trip_the_breaker(make_gateway):
+    gateway = make_gateway(retries=0, threshold=1)
+    with pytest.raises(stripe.error.InvalidRequestError):
+        await gateway.call(FlakyCall(stripe.error.InvalidRequestError('No such session', 'id')))
+    assert gateway.breaker.state == 'closed'
+
+
+async def test_full_queue_rejects_with_503(make_gateway):
+    gateway = make_gateway(workers=1, queue_size=0)
+    release = threading.Event()
+    busy = asyncio.ensure_future(gateway.call(FlakyCall(block=release)))
+    await asyncio.sleep(0.01)
+    try:
+        with pytest.raises(HTTPException) as raised:
+            await gateway.call(FlakyCall())
+        assert raised.value.status_code == 503
+        assert gateway.counters['rejected'] == 1
+    finally:
+        release.set()
+    assert await busy == 'ok'
+
+
+@pytest.fixture
+def fake_stripe_api(monkeypatch):
+    fake_stripe.FakeStripeHandler.delay = 0.0
+    server = ThreadingHTTPServer(('127.0.0.1', 0), fake_stripe.FakeStripeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(stripe, 'api_base', f'http://127.0.0.1:{server.server_address[1]}')
+    yield fake_stripe.FakeStripeHandler
+    server.shutdown()
+    server.server_close()
+    fake_stripe.FakeStripeHandler.delay = 0.0
+
+
+async def test_checkout_round_trip_against_the_fake_api(make_gateway, fake_stripe_api):
+    gateway = make_gateway()
+    session = await gateway.call(
+        stripe.checkout.Session.create,
+        mode='payment',
+        line_items=[{'price_data': {'currency': 'usd', 'unit_amount': 500}, 'quantity': 1}],
+        metadata={'org_id': 'org-1'}
+    )
+    assert session.metadata['org_id'] == 'org-1'
+
+    retrieved = await gateway.call(stripe.checkout.Session.retrieve, session.id, retry=True)
+    assert retrieved.payment_status == 'unpaid'
+
+
+async def test_stalled_fake_api_times_out(make_gateway, fake_stripe_api):
+    fake_stripe_api.delay = 0.3
+    gateway = make_gateway(timeout=0.05, retries=1)
+
+    with pytest.raises(HTTPException) as raised:
+        await gateway.call(stripe.checkout.Session.retrieve, 'cs_missing', retry=True)
+    assert raised.value.status_code == 504
+    assert gateway.counters['timeouts'] == 2
@@ -0,0 +1,92 @@
+import asyncio
+
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def wait_for_call(db, name: str):
+    while name not in db.calls:
+        await asyncio.sleep(0)
+
+
+async def test_task_written_during_a_poll_is_sent_on_the_next_poll(client, db, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+
+    release = db.hold('tasks', 'insert_one')
+    create = asyncio.ensure_future(client.post(
+        f'/api/organizations/{org_id}/tasks', json={'title': 'Landed late'}, headers=owner['headers']
+    ))
+    await wait_for_call(db, 'tasks.insert_one')
+
+    # The task is stamped but not stored yet when this poll runs
+    response = await client.get(f'/api/organizations/{org_id}/tasks/changes?since=0', headers=owner['headers'])
+    assert response.status_code == 200
+    first = response.json()
+    assert first['tasks'] == []
+
+    release.set()
+    created = (await create).json()
+    assert created['version'] > 0
+
+    response = await client.get(
+        f"/api/organizations/{org_id}/tasks/changes?since={first['version']}", headers=owner['headers']
+    )
+    second = response.json()
+    assert [task['id'] for task in second['tasks']] == [created['id']]
+    assert second['version'] >= first['version']
+
+
+async def test_deleted_task_is_reported_after_the_watermark(client, db, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+    response = await client.post(f'/api/organizations/{org_id}/tasks', json={'title': 'Short lived'}, headers=owner['headers'])
+    task_id = response.json()['id']
+
+    response = await client.get(f'/api/organizations/{org_id}/tasks/changes?since=0', headers=owner['headers'])
+    watermark = response.json()['version']
+    await client.delete(f'/api/organizations/{org_id}/tasks/{task_id}', headers=owner['headers'])
+
+    response = await client.get(f'/api/organizations/{org_id}/tasks/changes?since={watermark}', headers=owner['headers'])
+    assert response.json()['deleted'] == [task_id]
+    assert response.json()['tasks'] == []
+
+
+async def insert_unversioned_task(db, org_id: str, owner: dict) -> str:
+    await db.tasks.insert_one({
+        'id': 'legacy-task',
+        'org_id': org_id,
+        'title': 'From before versioning',
+        'status': 'pending',
+        'is_daily': False,
+        'created_by': owner['id'],
+        'created_at': '2024-01-01T00:00:00+00:00'
+    })
+    return f'/api/organizations/{org_id}/tasks/legacy-task'
+
+
+async def test_unversioned_task_accepts_if_match_zero(client, db, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+    task_url = await insert_unversioned_task(db, org_id, owner)
+
+    response = await client.patch(task_url, json={'status': 'completed'}, headers={**owner['headers'], 'If-Match': '"0"'})
+    assert response.status_code == 200
+    assert response.json()['version'] > 0
+
+
+async def test_backfill_brings_unversioned_tasks_into_delta_sync(client, db, make_user, make_org):
+    import server
+
+    owner = await make_user('Olive Owner')
+    org_id = await make_org(owner)
+    await insert_unversioned_task(db, org_id, owner)
+
+    assert await server.backfill_task_versions() == 1
+    assert await server.backfill_task_versions() == 0
+
+    response = await client.get(f'/api/organizations/{org_id}/tasks/changes?since=0', headers=owner['headers'])
+    [task] = response.json()['tasks']
+    assert task['id'] == 'legacy-task'
+    assert task['updated_at'] == '2024-01-01T00:00:00+00:00'
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from server import TaskEventHub
+
+pytestmark = pytest.mark.anyio
+
+
+class MemoryFeed:
+    """In-memory stand-in for the change stream: push() emits a task change."""
+
+    def __init__(self):
+        self.changes = asyncio.Queue()
+        self.opened_with = []
+        self.count = 0
+
+    def __call__(self, resume_after):
+        self.opened_with.append(resume_after)
+        return self.stream()
+
+    async def stream(self):
+        while True:
+            yield await self.changes.get()
+
+    def push(self, org_id: str, task_id: str) -> str:
+        self.count += 1
+        event_id = f'event-{self.count}'
+        self.changes.put_nowait({
+            '_id': {'_data': event_id},
+            'ns': {'coll': 'tasks'},
+            'fullDocument': {'_id': self.count, 'id': task_id, 'org_id': org_id, 'version': self.count}
+        })
+        return event_id
+
+
+async def settle():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def drain(queue: asyncio.Queue) -> list:
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+@pytest.fixture
+def feed():
+    return MemoryFeed()
+
+
+@pytest.fixture
+async def hub(feed):
+    hub = TaskEventHub(feed, queue_size=3, replay_size=100, idle_grace=0.05)
+    yield hub
+    await hub.close()
+
+
+async def test_events_fan_out_to_every_subscriber_of_the_org(hub, feed):
+    first = hub.subscribe('org-a')
+    second = hub.subscribe('org-a')
+    other = hub.subscribe('org-b')
+    await settle()
+
+    event_id = feed.push('org-a', 'task-1')
+    await settle()
+
+    for queue in (first, second):
+        [(received_id, payload)] = drain(queue)
+        assert received_id == event_id
+        assert payload == {'type': 'upsert', 'task': {'id': 'task-1', 'org_id': 'org-a', 'version': 1}}
+    assert drain(other) == []
+    assert feed.opened_with == [None]
+
+
+async def test_lone_client_reconnecting_within_the_grace_period_resumes(hub, feed):
+    queue = hub.subscribe('org-a')
+    await settle()
+    seen = feed.push('org-a', 'task-1')
+    await settle()
+    drain(queue)
+
+    hub.unsubscribe('org-a', queue)
+    missed = feed.push('org-a', 'task-2')
+    await settle()
+
+    queue = hub.subscribe('org-a', last_event_id=seen)
+    assert [event_id for event_id, _ in drain(queue)] == [missed]
+    assert feed.opened_with == [None]
+
+
+async def test_replay_is_dropped_once_the_grace_period_ends(hub, feed):
+    queue = hub.subscribe('org-a')
+    await settle()
+    seen = feed.push('org-a', 'task-1')
+    await settle()
+    hub.unsubscribe('org-a', queue)
+
+    await asyncio.sleep(hub.idle_grace * 3)
+    assert hub._runner is None
+
+    queue = hub.subscribe('org-a', last_event_id=seen)
+    assert drain(queue) == [TaskEventHub.RESET]
+
+
+async def test_slow_subscriber_is_reset_and_dropped(hub, feed):
+    slow = hub.subscribe('org-a')
+    await settle()
+
+    for number in range(hub.queue_size + 1):
+        feed.push('org-a', f'task-{number}')
+    await settle()
+
+    assert drain(slow) == [TaskEventHub.RESET]
+    assert hub.subscriber_count() == 0
@@ -0,0 +1,52 @@
+import pytest
+
+import server
+
+pytestmark = pytest.mark.anyio
+
+
+async def patch_and_count(client, db, make_user, make_org, warm_role: bool):
+    owner = await make_user('Olive Owner')
+    employee = await make_user('Eve Employee')
+    org_id = await make_org(owner, employee)
+    response = await client.post(f'/api/organizations/{org_id}/tasks', json={'title': 'Triage'}, headers=owner['headers'])
+    task_url = f"/api/organizations/{org_id}/tasks/{response.json()['id']}"
+
+    # Warm the principal (and maybe role) cache as earlier requests would; the name stays cold
+    await client.get(f'/api/organizations/{org_id}/members', headers=owner['headers'])
+    if not warm_role:
+        server.role_cache.clear()
+    server.name_resolver.names.clear()
+    db.reset()
+
+    response = await client.patch(
+        task_url, json={'status': 'about_to_do', 'assigned_to': employee['id']}, headers=owner['headers']
+    )
+    assert response.status_code == 200
+    assert response.json()['status'] == 'about_to_do'
+    assert response.json()['assigned_to_name'] == 'Eve Employee'
+    return db.round_trips
+
+
+async def test_patch_with_cached_role_takes_two_round_trips(client, db, make_user, make_org):
+    assert await patch_and_count(client, db, make_user, make_org, warm_role=True) == 2, db.calls
+
+
+async def test_patch_with_cold_role_cache_takes_three_round_trips(client, db, make_user, make_org):
+    assert await patch_and_count(client, db, make_user, make_org, warm_role=False) == 3, db.calls
+
+
+async def test_forbidden_patch_reports_why_without_writing(client, db, make_user, make_org):
+    owner = await make_user('Olive Owner')
+    employee = await make_user('Eve Employee')
+    org_id = await make_org(owner, employee)
+    response = await client.post(f'/api/organizations/{org_id}/tasks', json={'title': 'Not yours'}, headers=owner['headers'])
+    task = response.json()
+
+    response = await client.patch(
+        f"/api/organizations/{org_id}/tasks/{task['id']}", json={'status': 'completed'}, headers=employee['headers']
+    )
+    assert response.status_code == 403
+    stored = await db.tasks.find_one({'id': task['id']})
+    assert stored['status'] == task['status']
+    assert stored['version'] == task['version']